@@ -5,19 +5,18 @@ Integra análise exploratória, clustering, modelo de classificação e explicab
 """
 
 import os
+import hashlib
+import inspect
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import joblib
-from PIL import Image
-import streamlit.components.v1 as components
 
 # Importações dos scripts locais
+# (clustering_analysis/sklearn, joblib e components são importados
+# apenas nas funções/abas que os usam, para não pesar no cold start)
 from deploy.data_processing_for_deploy import load_and_preprocess_data
-from clustering_analysis import get_clustering_data_optimized, create_cluster_visualizations
-from data.geo_clustering import build_regions_for_recife
 
 st.set_page_config(
     page_title="ITBI Recife - Análise Completa",
@@ -25,79 +24,320 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ==================== FORMATAÇÃO ====================
+
+# Troca "," <-> "." numa única passada (padrão monetário brasileiro)
+_MOEDA_TABLE = str.maketrans(",.", ".,")
+
+def moeda(v):
+    """Formata um valor numérico como moeda brasileira (ex.: R$ 1.234,56)."""
+    try:
+        return f"R$ {v:,.2f}".translate(_MOEDA_TABLE)
+    except (TypeError, ValueError):
+        # Valor não numérico (ex.: None): exibe como veio, sem esconder outros erros
+        return str(v)
+
 # ==================== CACHE E DADOS ====================
 
-@st.cache_data(show_spinner=False)
+# Únicas colunas do ITBI consumidas pelas abas; o resto é descartado no carregamento
+KEEP_COLUMNS = [
+    "bairro", "tipo_imovel", "padrao_acabamento", "data_transacao",
+    "valor_avaliacao", "valor_m2", "area_construida", "area_terreno", "ano_transacao"
+]
+
+# Colunas de texto repetitivas usadas como chave de agrupamento/filtro
+CATEGORICAL_COLUMNS = ["bairro", "tipo_imovel", "padrao_acabamento"]
+
+# Padrão de acabamento tem ordem semântica: com categorias ordenadas, agrupar
+# por ele já devolve Simples < Médio < Superior, sem reordenar em cada gráfico
+PADRAO_ACABAMENTO_DTYPE = pd.CategoricalDtype(["Simples", "Médio", "Superior"], ordered=True)
+
+# Colunas numéricas convertidas para float32 (~7 dígitos significativos): o erro
+# máximo é de alguns reais em avaliações de centenas de milhões, invisível nos
+# valores exibidos, que são arredondados para reais inteiros
+FLOAT_COLUMNS = ["valor_avaliacao", "valor_m2", "area_construida", "area_terreno"]
+
+# Cache em disco do get_data já pré-processado (Parquet preserva categorias e
+# dtypes Arrow): um novo processo lê um único arquivo em vez de refazer
+# concatenação, filtros e conversões. Arquivo gerado, fora do git (.gitignore).
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+EDA_CACHE_FILE = os.path.join(DATA_DIR, "eda_cache.parquet")
+# Chave gravada nos metadados do Parquet para invalidar o cache quando o
+# pré-processamento muda (ver eda_cache_key)
+EDA_CACHE_KEY_FIELD = b"eda_cache_key"
+
+def build_eda_frame():
+    """Carrega o ITBI e aplica a seleção de colunas e os dtypes usados pelas abas."""
+    # A função já resolve o diretório internamente
+    df = load_and_preprocess_data()[KEEP_COLUMNS].copy()
+    # Categorical uma única vez: agrupamentos e filtros passam a comparar
+    # códigos inteiros em vez de strings
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    df["padrao_acabamento"] = df["padrao_acabamento"].astype(PADRAO_ACABAMENTO_DTYPE)
+    # float64 -> float32: metade dos bytes em cada média/mediana/filtro.
+    # astype explícito: to_numeric(downcast="float") só converte colunas cujos
+    # valores cabem exatamente em float32, o que quase nunca ocorre aqui
+    for col in FLOAT_COLUMNS:
+        df[col] = df[col].astype("float32")
+    # Demais colunas com dtypes Arrow: strings sem objetos Python por valor e
+    # envio direto ao frontend (st.dataframe) sem conversão pandas -> Arrow
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+def eda_cache_key():
+    """Hash do código e das constantes que geram o cache do EDA.
+
+    Qualquer alteração em load_and_preprocess_data, em build_eda_frame ou nas
+    listas de colunas/dtypes muda a chave e descarta o cache antigo.
+    """
+    fontes = "\n".join([
+        inspect.getsource(inspect.getmodule(load_and_preprocess_data)),
+        inspect.getsource(build_eda_frame),
+        repr((KEEP_COLUMNS, CATEGORICAL_COLUMNS, FLOAT_COLUMNS, PADRAO_ACABAMENTO_DTYPE)),
+    ])
+    return hashlib.sha256(fontes.encode("utf-8")).hexdigest().encode()
+
+def load_eda_cache():
+    """Lê o cache em disco do get_data, ou None se ausente/desatualizado."""
+    if not os.path.exists(EDA_CACHE_FILE):
+        return None
+    # Invalida se algum Parquet anual do ITBI for mais novo que o cache
+    cache_mtime = os.path.getmtime(EDA_CACHE_FILE)
+    sources = [
+        os.path.join(DATA_DIR, f) for f in os.listdir(DATA_DIR)
+        if f.startswith("itbi_") and f.endswith(".parquet")
+    ]
+    if any(os.path.getmtime(f) > cache_mtime for f in sources):
+        return None
+    try:
+        # Só o esquema (rodapé do arquivo): descarta o cache sem ler os dados
+        metadata = pq.read_schema(EDA_CACHE_FILE).metadata or {}
+        if metadata.get(EDA_CACHE_KEY_FIELD) != eda_cache_key():
+            return None
+        return pd.read_parquet(EDA_CACHE_FILE, engine="pyarrow")
+    except Exception as e:
+        print(f"Erro ao carregar cache do EDA: {e}")
+        return None
+
+def save_eda_cache(df):
+    """Grava o cache do EDA com a chave do pré-processamento nos metadados."""
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        EDA_CACHE_KEY_FIELD: eda_cache_key(),
+    })
+    try:
+        pq.write_table(table, EDA_CACHE_FILE, compression="snappy")
+    except OSError as e:
+        # Sistema de arquivos somente leitura (ex.: deploy): segue sem cache em disco
+        print(f"Não foi possível salvar o cache do EDA: {e}")
+
+# DataFrames grandes e somente leitura: cache_resource devolve o mesmo objeto
+# em memória a cada rerun, sem a cópia (pickle) que o cache_data faz no retorno.
+# Quem precisar alterar um desses frames deve trabalhar sobre um .copy().
+@st.cache_resource(show_spinner=False)
 def get_data():
     """Carrega dados gerais do ITBI."""
-    # A função já resolve o diretório internamente
-    return load_and_preprocess_data()
+    df = load_eda_cache()
+    if df is None:
+        df = build_eda_frame()
+        save_eda_cache(df)
+    return df
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
 def get_clustering_data():
     """Carrega dados de clustering de perfis (K-means)."""
-    return get_clustering_data_optimized()
+    from clustering_analysis import get_clustering_data_optimized
+    df_clustered, silhouette_score, features = get_clustering_data_optimized()
+    # Mesmo tratamento de get_data: categorias para as chaves de agrupamento,
+    # float32 explícito e inteiros no menor tipo que comporta os valores
+    for col in CATEGORICAL_COLUMNS:
+        if col in df_clustered.columns:
+            df_clustered[col] = df_clustered[col].astype("category")
+    for col in FLOAT_COLUMNS:
+        if col in df_clustered.columns:
+            df_clustered[col] = df_clustered[col].astype("float32")
+    for col in ["ano_construcao", "cluster"]:
+        df_clustered[col] = pd.to_numeric(df_clustered[col], downcast="integer")
+    return df_clustered, silhouette_score, features
+
+@st.cache_data(show_spinner=False)
+def get_form_options():
+    """Opções dos seletores do simulador: (bairros, tipos, padrões, clusters).
+
+    Só as quatro listas passam pelo cache; o DataFrame de clustering fica
+    fora do rerun do formulário.
+    """
+    df_clustered, _, _ = get_clustering_data()
+    # Colunas Categorical (ver get_clustering_data) já trazem as categorias
+    # distintas e ordenadas: dispensa o unique + sort sobre todas as linhas
+    bairros = df_clustered["bairro"].cat.categories.tolist()
+    tipos = df_clustered["tipo_imovel"].cat.categories.tolist()
+    # O cache do clustering guarda o padrão de acabamento em one-hot
+    # (padrao_acabamento_<valor>): as opções saem dos nomes dessas colunas
+    if "padrao_acabamento" in df_clustered.columns:
+        padroes = sorted(df_clustered["padrao_acabamento"].dropna().unique().tolist())
+    else:
+        padroes = [
+            p for p in PADRAO_ACABAMENTO_DTYPE.categories
+            if f"padrao_acabamento_{p}" in df_clustered.columns
+        ]
+    clusters = sorted(df_clustered["cluster"].unique().tolist())
+    return bairros, tipos, padroes, clusters
 
 @st.cache_resource(show_spinner="Carregando modelo de classificação...")
 def load_model():
     """Carrega o modelo de classificação treinado."""
+    import joblib
     try:
-        # O arquivo está na raiz do projeto
-        model = joblib.load('property_classifier_model_optimized.joblib')
+        # O arquivo está na raiz do projeto. Ele é salvo sem compressão
+        # (joblib.dump padrão), então os arrays das árvores são mapeados em
+        # memória em vez de copiados no cold start, como no deploy
+        model = joblib.load('property_classifier_model_optimized.joblib', mmap_mode='r')
         return model
     except FileNotFoundError:
         st.error("Arquivo do modelo 'property_classifier_model_optimized.joblib' não encontrado. Execute o script de treinamento do modelo primeiro.")
         return None
 
-# ==================== NAVEGAÇÃO PRINCIPAL ====================
-
-st.title("📊 Análise Completa do Mercado Imobiliário de Recife")
-st.caption("ITBI 2015-2023 • Dados Residenciais (Apartamentos e Casas)")
+@st.cache_data(show_spinner=False)
+def get_eda_kpis():
+    """Indicadores da aba EDA, agregados uma única vez sobre os dados cacheados."""
+    df = get_data()
+    return {
+        "total": len(df),
+        "valor_medio": float(df["valor_avaliacao"].mean()),
+        "valor_m2_mediano": float(df["valor_m2"].median()),
+        "ano_min": int(df["ano_transacao"].min()),
+        "ano_max": int(df["ano_transacao"].max()),
+    }
 
-# Adicionamos a nova tab de ML
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📈 EDA Exploratória",
-    "🎯 Clustering de Perfis",
-    "🗺️ Dashboard Regional",
-    "🔥 Análise Integrada",
-    "🤖 Predição & Explicabilidade"
-])
-
-# ==================== TAB 1: EDA EXPLORATÓRIA ====================
-with tab1:
+@st.cache_data(show_spinner=False)
+def get_valor_m2_por_bairro():
+    """Mediana do valor do m² por bairro, em ordem decrescente (agregada uma única vez)."""
+    df = get_data()
+    return (
+        df.groupby("bairro", observed=True, sort=False)["valor_m2"]
+        .median()
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+
+# ==================== CACHE DE FIGURAS ====================
+# As figuras são funções puras dos dados cacheados: construímos cada uma uma
+# única vez e reaproveitamos o objeto nos reruns seguintes. A chave é apenas
+# o parâmetro do gráfico (o DataFrame vem de get_data(), que já é cacheado).
+
+@st.cache_resource(show_spinner=False)
+def fig_top_bairros_valor_m2(top_n=10):
+    """Gráfico de barras dos bairros com maior valor m² (mediana)."""
+    # Parte do agregado por bairro já ordenado: nenhum groupby no DataFrame completo
+    return px.bar(get_valor_m2_por_bairro().head(top_n), x='bairro', y='valor_m2')
+
+@st.cache_resource(show_spinner=False)
+def fig_clusters():
+    """Figuras da clusterização (scatter, box e composição por tipo)."""
+    from clustering_analysis import create_cluster_visualizations
+    df_clustered, _, _ = get_clustering_data()
+    return create_cluster_visualizations(df_clustered)
+
+# ==================== PÁGINA 1: EDA EXPLORATÓRIA ====================
+def render_eda_page():
+    """Renderiza a página de análise exploratória."""
     st.header("Análise Exploratória de Dados")
-    df_eda = get_data()
-    # ... (O restante do código da tab1 permanece o mesmo)
-    st.plotly_chart(px.bar(df_eda.head(10), x='bairro', y='valor_m2'), use_container_width=True)
+    st.markdown("Visão geral do mercado imobiliário de Recife (todos os tipos de imóveis)")
+    
+    df = get_data()
+    
+    with st.sidebar:
+        st.subheader("🔍 Filtros - EDA")
+        # As categorias já vêm ordenadas: dispensa unique() + sorted()
+        bairros_disponiveis = df["bairro"].cat.categories.tolist()
+        selected_bairro = st.selectbox(
+            "Bairro (para referência)",
+            bairros_disponiveis,
+            index=bairros_disponiveis.index("BOA VIAGEM") if "BOA VIAGEM" in bairros_disponiveis else 0,
+            key="eda_bairro"
+        )
+        
+        if st.checkbox("Mostrar Dados Brutos"):
+            st.dataframe(df.head(100), use_container_width=True)
+    
+    # Agregados pré-calculados: filtros da sidebar não refazem as varreduras
+    kpis = get_eda_kpis()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total de Transações", f"{kpis['total']:,}".replace(",", "."))
+    col2.metric("Valor Médio", moeda(kpis['valor_medio']))
+    col3.metric("Valor m² Mediano", moeda(kpis['valor_m2_mediano']))
+    col4.metric("Período", f"{kpis['ano_min']}-{kpis['ano_max']}")
 
+    st.plotly_chart(fig_top_bairros_valor_m2(10), use_container_width=True)
 
-# ==================== TAB 2: CLUSTERING DE PERFIS ====================
-with tab2:
+
+# ==================== PÁGINA 2: CLUSTERING DE PERFIS ====================
+def render_clustering_page():
+    """Renderiza a página de clustering de perfis (K-means)."""
     st.header("🎯 Clustering de Perfis de Mercado")
-    df_clustered, silhouette_score, features = get_clustering_data()
-    # ... (O restante do código da tab2 permanece o mesmo)
-    st.metric("Silhouette Score", f"{silhouette_score:.3f}")
+    st.markdown("Segmentação inteligente em 5 perfis usando K-means (dados residenciais)")
+    
+    with st.spinner("Carregando clustering de perfis..."):
+        df_clustered, silhouette_score, features = get_clustering_data()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Imóveis Analisados", f"{len(df_clustered):,}".replace(",", "."))
+    col2.metric("Silhouette Score", f"{silhouette_score:.3f}")
+    col3.metric("Clusters", "5 perfis")
+    col4.metric("Features", len(features))
+
+    figs = fig_clusters()
+    col_left, col_right = st.columns(2)
+    with col_left:
+        st.plotly_chart(figs[0], use_container_width=True)
+    with col_right:
+        st.plotly_chart(figs[1], use_container_width=True)
+    st.plotly_chart(figs[2], use_container_width=True)
 
 
-# ==================== TAB 3: DASHBOARD REGIONAL ====================
-with tab3:
+# ==================== PÁGINA 3: DASHBOARD REGIONAL ====================
+def render_regional_page():
+    """Renderiza a página do dashboard regional."""
     st.header("🗺️ Dashboard Regional (IBGE)")
-    # ... (O restante do código da tab3 permanece o mesmo)
     st.info("Análise por regiões geográficas com agrupamento de subdistritos.")
 
 
-# ==================== TAB 4: ANÁLISE INTEGRADA ====================
-with tab4:
+# ==================== PÁGINA 4: ANÁLISE INTEGRADA ====================
+def render_integrada_page():
+    """Renderiza a página de análise integrada (perfis × regiões)."""
     st.header("🔥 Análise Integrada: Perfis × Regiões")
-    # ... (O restante do código da tab4 permanece o mesmo)
     st.info("Cruzamento dos clusters de mercado com regiões geográficas.")
 
 
-# ==================== TAB 5: PREDIÇÃO & EXPLICABILIDADE ====================
-with tab5:
+# ==================== PÁGINA 5: PREDIÇÃO & EXPLICABILIDADE ====================
+# Artefatos gerados por shap_explainer.py (na raiz do projeto)
+SHAP_FILES = [
+    'shap_summary_bar.png',
+    'shap_summary_beeswarm_Alto Valor.png',
+    'shap_summary_beeswarm_Médio.png',
+    'shap_summary_beeswarm_Econômico.png',
+    'shap_force_plot_local.html',
+]
+
+@st.cache_data(show_spinner=False)
+def load_shap_force_plot_html(mtime):
+    """HTML do force plot lido do disco uma vez por versão do arquivo (`mtime` é só chave de cache)."""
+    with open('shap_force_plot_local.html', 'r', encoding='utf-8') as f:
+        return f.read()
+
+# Fragmento: o envio do formulário reexecuta apenas esta página, sem
+# percorrer de novo a navegação (as páginas 1 e 2 usam a sidebar, que não é
+# permitida em fragmentos, e não têm widgets próprios que justifiquem isolá-las)
+@st.fragment
+def render_predicao_tab():
+    """Renderiza a página de predição (SHAP + simulador)."""
     st.header("🤖 Predição de Categoria de Valor & Explicabilidade (XAI)")
     st.markdown("Entendendo e utilizando o modelo de Machine Learning para prever a categoria de valor de um imóvel.")
 
+    import streamlit.components.v1 as components
+
     model = load_model()
 
     if model:
@@ -106,23 +346,24 @@ with tab5:
         Os gráficos a seguir foram gerados com a biblioteca SHAP para nos ajudar a entender o comportamento do modelo de classificação. Eles mostram quais características (features) são mais importantes para as decisões do modelo.
         """)
 
-        # Exibir gráficos SHAP
-        try:
-            st.image(Image.open('shap_summary_bar.png'), caption='Importância Global das Features (SHAP)', use_column_width=True)
+        # Exibir gráficos SHAP. st.image recebe o caminho e envia o PNG como
+        # está ao navegador, sem decodificar os pixels com PIL no servidor;
+        # por isso a existência dos arquivos é verificada antes
+        if all(os.path.exists(f) for f in SHAP_FILES):
+            st.image('shap_summary_bar.png', caption='Importância Global das Features (SHAP)', use_container_width=True)
 
             with st.expander("Ver análise detalhada por classe (Beeswarm plots)"):
-                st.image(Image.open('shap_summary_beeswarm_Alto Valor.png'), caption='Impacto das Features na Classe: Alto Valor', use_column_width=True)
-                st.image(Image.open('shap_summary_beeswarm_Médio.png'), caption='Impacto das Features na Classe: Médio', use_column_width=True)
-                st.image(Image.open('shap_summary_beeswarm_Econômico.png'), caption='Impacto das Features na Classe: Econômico', use_column_width=True)
+                st.image('shap_summary_beeswarm_Alto Valor.png', caption='Impacto das Features na Classe: Alto Valor', use_container_width=True)
+                st.image('shap_summary_beeswarm_Médio.png', caption='Impacto das Features na Classe: Médio', use_container_width=True)
+                st.image('shap_summary_beeswarm_Econômico.png', caption='Impacto das Features na Classe: Econômico', use_container_width=True)
 
             st.subheader("🔬 Análise de uma Predição Individual (Force Plot)")
             st.markdown("O gráfico abaixo é interativo e mostra como cada feature contribuiu para uma predição específica.")
             
-            with open('shap_force_plot_local.html', 'r', encoding='utf-8') as f:
-                html_string = f.read()
+            html_string = load_shap_force_plot_html(os.path.getmtime('shap_force_plot_local.html'))
             components.html(html_string, height=200, scrolling=True)
 
-        except FileNotFoundError:
+        else:
             st.warning("Gráficos de SHAP não encontrados. Execute o script `shap_explainer.py` para gerá-los.")
 
         st.divider()
@@ -132,11 +373,8 @@ with tab5:
         st.markdown("Insira os dados de um imóvel para obter uma previsão da sua categoria de valor.")
         
         # Obter opções para os seletores a partir dos dados de treino
-        df_base, _, _ = get_clustering_data()
-        bairros_options = sorted(df_base['bairro'].unique())
-        tipo_imovel_options = sorted(df_base['tipo_imovel'].unique())
-        padrao_acabamento_options = sorted(df_base['padrao_acabamento'].unique())
-        cluster_options = sorted(df_base['cluster'].unique())
+        # (cacheadas: unique + sort não rodam a cada interação)
+        bairros_options, tipo_imovel_options, padrao_acabamento_options, cluster_options = get_form_options()
 
         with st.form("prediction_form"):
             col1, col2, col3 = st.columns(3)
@@ -178,56 +416,27 @@ with tab5:
             prob_df = prob_df.sort_values('Probabilidade', ascending=False)
             
             fig_prob = px.bar(prob_df, x='Probabilidade', y='Classe', orientation='h', 
-                              title='Probabilidades da Predição', text=prob_df['Probabilidade'].apply(lambda x: f'{x:.1%}'))
+                              title='Probabilidades da Predição', text=prob_df['Probabilidade'].map('{:.1%}'.format))
             fig_prob.update_layout(xaxis_title="Probabilidade", yaxis_title="Categoria", uniformtext_minsize=8, uniformtext_mode='hide')
             st.plotly_chart(fig_prob, use_container_width=True)
 
 
-# Restaurar o código original das outras abas para garantir que continuem funcionando
-with tab1:
-    st.header("Análise Exploratória de Dados")
-    st.markdown("Visão geral do mercado imobiliário de Recife (todos os tipos de imóveis)")
-    
-    df = get_data()
-    
-    with st.sidebar:
-        st.subheader("🔍 Filtros - EDA")
-        bairros_disponiveis = sorted(df["bairro"].unique().tolist())
-        selected_bairro = st.selectbox(
-            "Bairro (para referência)",
-            bairros_disponiveis,
-            index=bairros_disponiveis.index("BOA VIAGEM") if "BOA VIAGEM" in bairros_disponiveis else 0,
-            key="eda_bairro"
-        )
-        
-        if st.checkbox("Mostrar Dados Brutos"):
-            st.dataframe(df.head(100), use_container_width=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total de Transações", f"{len(df):,}".replace(",", "."))
-    col2.metric("Valor Médio", f"R$ {df['valor_avaliacao'].mean():,.2f}")
-    col3.metric("Valor m² Mediano", f"R$ {df['valor_m2'].median():,.2f}")
-    col4.metric("Período", "2015-2023")
-    
-    # ... Adicionar aqui o restante dos gráficos da tab1 se necessário
+# ==================== NAVEGAÇÃO PRINCIPAL ====================
 
-with tab2:
-    st.header("🎯 Clustering de Perfis de Mercado")
-    st.markdown("Segmentação inteligente em 5 perfis usando K-means (dados residenciais)")
-    
-    with st.spinner("Carregando clustering de perfis..."):
-        df_clustered, silhouette_score, features = get_clustering_data()
-    
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Imóveis Analisados", f"{len(df_clustered):,}".replace(",", "."))
-    col2.metric("Silhouette Score", f"{silhouette_score:.3f}")
-    col3.metric("Clusters", "5 perfis")
-    col4.metric("Features", len(features))
+st.title("📊 Análise Completa do Mercado Imobiliário de Recife")
+st.caption("ITBI 2015-2023 • Dados Residenciais (Apartamentos e Casas)")
 
-    figs = create_cluster_visualizations(df_clustered)
-    col_left, col_right = st.columns(2)
-    with col_left:
-        st.plotly_chart(figs[0], use_container_width=True)
-    with col_right:
-        st.plotly_chart(figs[1], use_container_width=True)
-    st.plotly_chart(figs[2], use_container_width=True)
+# Navegação por rádio em vez de st.tabs: com abas, o corpo de todas elas roda
+# a cada rerun; aqui só a página selecionada é construída
+PAGES = {
+    "📈 EDA Exploratória": render_eda_page,
+    "🎯 Clustering de Perfis": render_clustering_page,
+    "🗺️ Dashboard Regional": render_regional_page,
+    "🔥 Análise Integrada": render_integrada_page,
+    "🤖 Predição & Explicabilidade": render_predicao_tab,
+}
+
+with st.sidebar:
+    page = st.radio("Seção", list(PAGES), key="page")
+
+PAGES[page]()
@@ -1,39 +1,65 @@
 import plotly.express as px
 import pandas as pd
 
+# Tipos comparáveis usados nos gráficos de valor/quantidade
+TIPOS_RESIDENCIAIS = ["Apartamento", "Casa"]
+
+def filtrar_residencial(df: pd.DataFrame) -> pd.DataFrame:
+    """Subconjunto residencial (Apartamento, Casa) consumido pelos gráficos.
+
+    Feito uma vez por quem chama e repassado a cada `plot_*`, em vez de cada
+    função varrer o DataFrame inteiro com o mesmo `isin`.
+    """
+    return df[df["tipo_imovel"].isin(TIPOS_RESIDENCIAIS)]
+
+def agregar_por_bairro(df_res: pd.DataFrame) -> pd.DataFrame:
+    """Estatísticas por bairro compartilhadas pelos gráficos de bairro.
+
+    Um único groupby com média e mediana do `valor_m2` e a quantidade de
+    transações; cada gráfico seleciona a coluna que precisa.
+    """
+    return df_res.groupby("bairro", observed=True, sort=False).agg(
+        mean=("valor_m2", "mean"),
+        median=("valor_m2", "median"),
+        qtd_transacoes=("valor_m2", "size"),
+    ).reset_index()
+
 def plot_valor_m2_por_bairro(
-    df: pd.DataFrame,
+    df_res: pd.DataFrame,
     tipo_agregacao: str = "median",
-    top_n: int = 20
+    top_n: int = 20,
+    agg_bairro: pd.DataFrame = None
 ):
     """
     Retorna um gráfico de barras com a média ou mediana do valor por m²
     por bairro, permitindo escolher o tipo de agregação e o número de bairros.
 
     Parâmetros:
-        df: DataFrame já pré-processado contendo colunas `tipo_imovel`,
-            `bairro` e `valor_m2`.
+        df_res: DataFrame já filtrado por `filtrar_residencial`, contendo
+            as colunas `bairro` e `valor_m2`.
         tipo_agregacao: 'mean' ou 'median' para definir a agregação.
         top_n: Número de bairros a mostrar (ex: 10 ou 20).
+        agg_bairro: resultado de `agregar_por_bairro(df_res)`, quando já
+            calculado por quem chama (evita refazer o groupby).
 
     Retorno:
         plotly.graph_objs.Figure pronto para exibir.
     """
-    # Filtra apenas apartamentos e casas
-    df_filtered = df[df["tipo_imovel"].isin(["Apartamento", "Casa"])]
+    if agg_bairro is None:
+        agg_bairro = agregar_por_bairro(df_res)
 
     # Escolhe agregação
     if tipo_agregacao == "mean":
-        df_grouped = df_filtered.groupby("bairro")["valor_m2"].mean().reset_index()
+        df_grouped = agg_bairro[["bairro", "mean"]].rename(columns={"mean": "valor_m2"})
         titulo = f"Média do Valor do Metro Quadrado por Bairro (Top {top_n})"
         ylabel = "Valor do m² (R$) - Média"
     else:
-        df_grouped = df_filtered.groupby("bairro")["valor_m2"].median().reset_index()
+        df_grouped = agg_bairro[["bairro", "median"]].rename(columns={"median": "valor_m2"})
         titulo = f"Mediana do Valor do Metro Quadrado por Bairro (Top {top_n})"
         ylabel = "Valor do m² (R$) - Mediana"
 
-    # Ordena e pega os Top N bairros
-    df_grouped = df_grouped.sort_values(by="valor_m2", ascending=False).head(top_n)
+    # Top N bairros (seleção parcial via heap, sem ordenar todos os bairros)
+    df_grouped = df_grouped.nlargest(top_n, "valor_m2")
 
     fig = px.bar(
         df_grouped,
@@ -47,21 +73,21 @@ def plot_valor_m2_por_bairro(
     fig.update_layout(xaxis_tickangle=-45)
     return fig
 
-def plot_qtd_transacoes_por_bairro(df: pd.DataFrame):
+def plot_qtd_transacoes_por_bairro(df_res: pd.DataFrame, agg_bairro: pd.DataFrame = None):
     """Gera um gráfico de barras com a quantidade de transações por bairro.
 
     Detalhes:
-    - Filtra imóveis comparáveis (Apartamento, Casa).
-    - Usa `value_counts()` em `bairro` para contar transações por bairro.=
+    - Recebe imóveis comparáveis (Apartamento, Casa), já filtrados por
+      `filtrar_residencial`.
+    - Usa a contagem por bairro de `agregar_por_bairro` (recebida em
+      `agg_bairro` ou calculada aqui), do maior para o menor.
     """
-    # Filtra para manter comparabilidade entre tipos
-    df_filtered = df[df["tipo_imovel"].isin(["Apartamento", "Casa"])]
-    # Conta as ocorrências por bairro e transforma em DataFrame
-    df_grouped = df_filtered["bairro"].value_counts().reset_index()
-    df_grouped.columns = ["bairro", "qtd_transacoes"]
+    if agg_bairro is None:
+        agg_bairro = agregar_por_bairro(df_res)
+    df_grouped = agg_bairro[["bairro", "qtd_transacoes"]].sort_values("qtd_transacoes", ascending=False)
     # Calcula o total de transações e os tipos presentes
     total_transacoes = df_grouped["qtd_transacoes"].sum()
-    tipos_presentes = ", ".join(sorted(df_filtered["tipo_imovel"].unique()))
+    tipos_presentes = ", ".join(sorted(df_res["tipo_imovel"].unique()))
     # Adiciona legenda personalizada ao gráfico
     fig = px.bar(
         df_grouped,
@@ -76,40 +102,31 @@ def plot_qtd_transacoes_por_bairro(df: pd.DataFrame):
         xaxis_tickangle=-45,
         legend_title_text=f"Total: {total_transacoes} transações | Tipos: {tipos_presentes}"
     )
-    # Monta o gráfico com escala de cor para o count
-    fig = px.bar(
-        df_grouped,
-        x="bairro",
-        y="qtd_transacoes",
-        title="Quantidade de Transações por Bairro (Top 20)",
-        labels={"bairro": "Bairro", "qtd_transacoes": "Quantidade de Transações"},
-        color="qtd_transacoes",
-        color_continuous_scale=px.colors.sequential.Blues,
-    )
-    fig.update_layout(xaxis_tickangle=-45)
     return fig
 
-def plot_valor_transacao_por_acabamento(df: pd.DataFrame):
+def plot_valor_transacao_por_acabamento(df_res: pd.DataFrame):
     """Plota a mediana do valor da transação por padrão de acabamento.
 
     Observações:
-    - Converte `padrao_acabamento` para Categorical com ordem semântica
-      (Simples < Médio < Superior) para que a ordenação do gráfico faça
-      sentido.
+    - Ordena `padrao_acabamento` pela ordem semântica (Simples < Médio <
+      Superior) para que a ordenação do gráfico faça sentido. Se a coluna
+      já vier como Categorical ordenado (ver `get_data` em app.py), o próprio
+      groupby devolve essa ordem.
     - Calcula a mediana do valor de avaliação para cada categoria.
+    - Recebe o DataFrame já filtrado por `filtrar_residencial`.
     """
-    df_filtered = df[df["tipo_imovel"].isin(["Apartamento", "Casa"])]
-
     # Agrupa por padrão de acabamento calculando a média
-    df_grouped = df_filtered.groupby("padrao_acabamento")["valor_avaliacao"].mean().reset_index()
-
-    # Define a ordem desejada para as categorias de acabamento
-    df_grouped["padrao_acabamento"] = pd.Categorical(
-        df_grouped["padrao_acabamento"],
-        categories=["Simples", "Médio", "Superior"],
-        ordered=True,
-    )
-    df_grouped = df_grouped.sort_values(by="padrao_acabamento")
+    df_grouped = df_res.groupby("padrao_acabamento", observed=True)["valor_avaliacao"].mean().reset_index()
+
+    # Define a ordem desejada para as categorias de acabamento (só quando a
+    # coluna de entrada ainda não é um Categorical ordenado)
+    if not getattr(df_grouped["padrao_acabamento"].dtype, "ordered", False):
+        df_grouped["padrao_acabamento"] = pd.Categorical(
+            df_grouped["padrao_acabamento"],
+            categories=["Simples", "Médio", "Superior"],
+            ordered=True,
+        )
+        df_grouped = df_grouped.sort_values(by="padrao_acabamento")
 
     fig = px.bar(
         df_grouped,
@@ -122,17 +139,18 @@ def plot_valor_transacao_por_acabamento(df: pd.DataFrame):
     )
     return fig
 
-def plot_valor_m2_por_ano(df: pd.DataFrame):
+def plot_valor_m2_por_ano(df_res: pd.DataFrame):
     """Desenha a evolução temporal (por ano) da mediana do valor do m².
 
-    - Agrupa pela coluna `data_transacao` extraindo o ano via `.dt.year`.
+    - Agrupa pela coluna `ano_transacao` (int16, pré-calculada em
+      `load_and_preprocess_data`).
     - Calcula a mediana anual de `valor_m2`.
     - Retorna um gráfico de linhas com marcadores.
+    - Recebe o DataFrame já filtrado por `filtrar_residencial`.
     """
-    df_filtered = df[df["tipo_imovel"].isin(["Apartamento", "Casa"])]
-
-    # Agrupa por ano extraído da data de transação
-    df_grouped = df_filtered.groupby(df["data_transacao"].dt.year)["valor_m2"].median().reset_index()
+    # Agrupa pelo ano da transação (só das linhas filtradas: o gráfico já
+    # recebe um ponto por ano, sem necessidade de downsampling)
+    df_grouped = df_res.groupby("ano_transacao", observed=True)["valor_m2"].median().reset_index()
     df_grouped.columns = ["ano", "valor_m2"]
 
     fig = px.line(
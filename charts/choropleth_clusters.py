@@ -20,14 +20,14 @@ property CSV, the choropleth layer will not be rendered (the scatter layer will
 
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
-from collections import Counter
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+import plotly.graph_objects as go
+from sklearn.cluster import KMeans, MiniBatchKMeans
 
 ROOT = Path(__file__).resolve().parents[1]
 CHARTS_DIR = Path(__file__).resolve().parent
@@ -46,6 +46,13 @@ CSV_FILES = [ROOT / 'quintoandar_recife.csv', ROOT / 'vivareal_recife.csv']
 GEOJSON_PATH = ROOT / 'data' / 'geodata' / 'recife_bairros.geojson'
 CLUSTER_META = ROOT / 'data' / 'clustering_metadata.json'
 
+# Above this many rows the clustering switches to MiniBatchKMeans (full-batch
+# KMeans scales with every row on every iteration)
+MINIBATCH_THRESHOLD = 10_000
+# Maximum number of rows the standardization/KMeans are fitted on; larger inputs are
+# sampled for the fit and then all rows are assigned with predict()
+FIT_SAMPLE_SIZE = 20_000
+
 
 def choose_existing_csv():
     files = [f for f in CSV_FILES if f.exists() and f.stat().st_size > 0]
@@ -59,7 +66,19 @@ def choose_existing_csv():
 
 
 def load_properties(csv_path: Path):
-    # try common encodings and separators
+    # multi-threaded pyarrow parser first (UTF-8); numpy dtypes are kept so the
+    # numeric casts and float32 matrix in compute_clusters behave as before
+    try:
+        df = pd.read_csv(csv_path, engine='pyarrow')
+        # non-UTF-8 text (e.g. latin-1) comes back as bytes instead of failing:
+        # leave those files to the encoding loop below
+        first_text = [df[c].dropna().iloc[:1] for c in df.select_dtypes('object')]
+        is_binary = any(isinstance(v, bytes) for col in first_text for v in col)
+        if df.shape[0] > 0 and not is_binary:
+            return df
+    except Exception:
+        pass
+    # fallback: try common encodings and separators
     for enc in (None, 'utf-8', 'latin-1'):
         try:
             df = pd.read_csv(csv_path, encoding=enc, low_memory=False)
@@ -120,13 +139,39 @@ def compute_clusters(df: pd.DataFrame, n_clusters=5):
     if not features:
         raise RuntimeError('No numeric features available to cluster')
 
-    X = df[features].copy()
-    X = X.fillna(X.median())
-    scaler = StandardScaler()
-    Xs = scaler.fit_transform(X)
-    model = KMeans(n_clusters=n_clusters, random_state=42)
-    clusters = model.fit_predict(Xs)
-    return clusters
+    # contiguous float32 matrix: half the memory traffic of float64 in the
+    # standardization and in KMeans' distance kernels, with near-identical clusters
+    X = df[features].to_numpy(dtype=np.float32)
+    nan_mask = np.isnan(X)
+    if nan_mask.any():
+        X = np.where(nan_mask, np.nanmedian(X, axis=0), X)
+    # centroids are stable under uniform sub-sampling: fit on a sample and
+    # assign every row afterwards
+    if len(X) > FIT_SAMPLE_SIZE:
+        rng = np.random.default_rng(42)
+        X_fit = X[rng.choice(len(X), size=FIT_SAMPLE_SIZE, replace=False)]
+    else:
+        X_fit = X
+    # z-score in plain numpy (same as StandardScaler: population std, constant
+    # columns left unscaled) for the 2-4 feature columns
+    mu = X_fit.mean(axis=0)
+    sd = X_fit.std(axis=0)
+    sd[sd == 0] = 1
+    Xs = (X_fit - mu) / sd
+    if len(X_fit) > MINIBATCH_THRESHOLD:
+        model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3,
+                                max_iter=100, init='k-means++', random_state=42)
+    else:
+        # a single k-means++ start is enough on standardized features (explicit,
+        # since the n_init default changed across sklearn versions); Elkan's
+        # triangle-inequality bounds prune most distance computations in low dims
+        model = KMeans(n_clusters=n_clusters, init='k-means++', n_init=1,
+                       algorithm='elkan', random_state=42)
+    model.fit(Xs)
+    if X_fit is X:
+        # the fit already stores the assignments; no second pass over Xs needed
+        return model.labels_
+    return model.predict((X - mu) / sd)
 
 
 def find_geojson_name_key(geojson):
@@ -150,6 +195,17 @@ def find_geojson_name_key(geojson):
     return keys[0]
 
 
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Crude name normalization: strip accents and punctuation (vectorized)."""
+    return (
+        names.str.normalize('NFKD')
+        .str.encode('ascii', 'ignore')
+        .str.decode('ascii')
+        .str.replace(r'[^a-z0-9 ]', '', regex=True)
+        .str.strip()
+    )
+
+
 def map_neighborhoods_to_geo(geojson, df_nb_values, geo_name_key):
     # Build a mapping from normalized names in geojson to the actual property value
     mapping = {}
@@ -159,44 +215,55 @@ def map_neighborhoods_to_geo(geojson, df_nb_values, geo_name_key):
         if val is None:
             continue
         mapping[str(val).strip().lower()] = val
+    # Accent/punctuation-free lookup built once (first geojson name wins on ties),
+    # instead of re-normalizing every geojson key for each unmatched neighborhood
+    norm_keys = normalize_names(pd.Series(list(mapping.keys()), dtype=object))
+    norm_mapping = {}
+    for mk_norm, mv in zip(norm_keys, mapping.values()):
+        norm_mapping.setdefault(mk_norm, mv)
+
     # Attempt to create a new column feature_id matching geojson property values
-    feature_ids = []
-    for nb in df_nb_values:
-        if pd.isna(nb):
-            feature_ids.append(None)
-            continue
-        key = str(nb).strip().lower()
-        if key in mapping:
-            feature_ids.append(mapping[key])
-        else:
-            # try crude normalization: remove accents and punctuation
-            import unicodedata, re
-            key_norm = unicodedata.normalize('NFKD', key).encode('ASCII', 'ignore').decode()
-            key_norm = re.sub(r'[^a-z0-9 ]', '', key_norm).strip()
-            found = None
-            for mk, mv in mapping.items():
-                mk_norm = unicodedata.normalize('NFKD', mk).encode('ASCII', 'ignore').decode()
-                mk_norm = re.sub(r'[^a-z0-9 ]', '', mk_norm).strip()
-                if mk_norm == key_norm:
-                    found = mv
-                    break
-            feature_ids.append(found)
-    return feature_ids
+    names = pd.Series(list(df_nb_values), dtype=object)
+    valid = names.notna()
+    keys = names[valid].astype(str).str.strip().str.lower()
+    found = keys.map(mapping)
+    missing = found.isna()
+    if missing.any():
+        # try crude normalization: remove accents and punctuation
+        found[missing] = normalize_names(keys[missing]).map(norm_mapping)
 
+    feature_ids = pd.Series(None, index=names.index, dtype=object)
+    feature_ids[valid] = found
+    return [None if pd.isna(v) else v for v in feature_ids]
 
-def main():
-    print('Starting choropleth + clusters generation...')
 
-    csv_path = choose_existing_csv()
-    if not csv_path:
-        print('No property CSV found (quintoandar_recife.csv or vivareal_recife.csv). Aborting.')
-        return
+@lru_cache(maxsize=4)
+def _read_geojson(path_str, mtime, size):
+    # mtime/size are part of the cache key only: an edited file is re-read
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_geojson(path: Path = GEOJSON_PATH):
+    """Parsed geojson (cached per file version), or None if the file is missing.
 
+    The returned dict is shared between calls and must not be mutated.
+    """
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return _read_geojson(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def prepare_properties(csv_path: Path):
+    """Load the property CSV with standardized columns and a `cluster` column.
+
+    Returns None if the CSV is empty.
+    """
     print(f'Loading properties from: {csv_path}')
     df = load_properties(csv_path)
     if df.shape[0] == 0:
-        print('CSV appears empty. Aborting.')
-        return
+        return None
 
     df = standardize_columns(df)
 
@@ -233,33 +300,61 @@ def main():
             print('Failed to compute clusters:', e)
     else:
         print('Using existing cluster column in dataframe')
+    return df
+
+
+def compute_nb_agg(df: pd.DataFrame, geojson):
+    """Per-neighborhood aggregates matched to geojson features.
+
+    Returns (choropleth_df, geo_name_key); choropleth_df is None when the
+    choropleth layer can't be built.
+    """
+    if 'neighborhood' not in df.columns:
+        print('No neighborhood column in properties dataframe; skipping choropleth.')
+        return None, None
+    if geojson is None:
+        return None, None
+
+    nb_agg = df.groupby('neighborhood').agg(
+        avg_price=('price', 'mean'),
+        count_properties=('price', 'count'),
+    )
+    # dominant cluster per neighborhood: argmax of the neighborhood x cluster
+    # count table, instead of a Python Counter per group
+    dominant = df.groupby(['neighborhood', 'cluster']).size().unstack(fill_value=0).idxmax(axis=1)
+    nb_agg['dominant_cluster'] = dominant.reindex(nb_agg.index).fillna(-1).astype(int)
+    nb_agg = nb_agg.reset_index()
+    # match neighborhood strings to geojson properties
+    geo_name_key = find_geojson_name_key(geojson)
+    print(f'Using geojson name key: {geo_name_key}')
+    nb_agg['feature_id'] = map_neighborhoods_to_geo(geojson, nb_agg['neighborhood'], geo_name_key)
+    choropleth_df = nb_agg.dropna(subset=['feature_id'])
+    if choropleth_df.empty:
+        print('No matching neighborhood names found between CSV and GeoJSON — choropleth will be skipped.')
+        return None, geo_name_key
+    return choropleth_df, geo_name_key
+
+
+def main():
+    print('Starting choropleth + clusters generation...')
+
+    csv_path = choose_existing_csv()
+    if not csv_path:
+        print('No property CSV found (quintoandar_recife.csv or vivareal_recife.csv). Aborting.')
+        return
+
+    df = prepare_properties(csv_path)
+    if df is None:
+        print('CSV appears empty. Aborting.')
+        return
 
     # Load geojson
-    if not GEOJSON_PATH.exists():
+    geojson = load_geojson()
+    if geojson is None:
         print(f'GeoJSON not found at {GEOJSON_PATH}; choropleth disabled.')
-        geojson = None
-    else:
-        geojson = json.load(open(GEOJSON_PATH, 'r', encoding='utf-8'))
 
     # Prepare per-neighborhood aggregates if neighborhood info exists
-    choropleth_df = None
-    if 'neighborhood' in df.columns and geojson is not None:
-        nb_agg = df.groupby('neighborhood').agg(
-            avg_price=('price', 'mean'),
-            count_properties=('price', 'count'),
-            dominant_cluster=('cluster', lambda x: int(Counter(x).most_common(1)[0][0]) if len(x) else -1)
-        ).reset_index()
-        # match neighborhood strings to geojson properties
-        geo_name_key = find_geojson_name_key(geojson)
-        print(f'Using geojson name key: {geo_name_key}')
-        nb_agg['feature_id'] = map_neighborhoods_to_geo(geojson, nb_agg['neighborhood'], geo_name_key)
-        choropleth_df = nb_agg.dropna(subset=['feature_id'])
-        if choropleth_df.empty:
-            print('No matching neighborhood names found between CSV and GeoJSON — choropleth will be skipped.')
-            choropleth_df = None
-    else:
-        if 'neighborhood' not in df.columns:
-            print('No neighborhood column in properties dataframe; skipping choropleth.')
+    choropleth_df, geo_name_key = compute_nb_agg(df, geojson)
 
     # Create map
     # Use mapbox style that doesn't require token
@@ -300,20 +395,28 @@ def main():
             print('Large dataset detected — sampling 5000 points for visualization')
             plot_df = plot_df.sample(5000, random_state=42)
 
-        scatter = px.scatter_mapbox(
-            plot_df,
-            lat='latitude',
-            lon='longitude',
-            color='cluster' if 'cluster' in plot_df.columns else None,
-            size='area' if 'area' in plot_df.columns else None,
-            hover_data=[c for c in ['id', 'price', 'area', 'neighborhood', 'cluster'] if c in plot_df.columns],
-            opacity=0.8,
-            zoom=11,
-            mapbox_style=mapbox_style,
-            center=center,
-        )
-        for trace in scatter.data:
-            fig.add_trace(trace)
+        # a single Scattermapbox trace (WebGL-rendered) added straight to the
+        # figure, instead of building a whole px figure just to copy its traces
+        marker = dict(opacity=0.8, size=8)
+        if 'cluster' in plot_df.columns:
+            # own color scale: px reused the choropleth's coloraxis (avg_price)
+            marker.update(color=plot_df['cluster'].to_numpy(), colorscale='Turbo', showscale=False)
+        if 'area' in plot_df.columns:
+            # area-proportional sizes in 4..20 px (px's size_max default)
+            area = plot_df['area'].fillna(0).clip(lower=0).to_numpy(dtype=np.float32)
+            max_area = area.max()
+            if max_area > 0:
+                marker['size'] = 4 + 16 * np.sqrt(area / max_area)
+        hover_cols = [c for c in ['id', 'price', 'area', 'neighborhood', 'cluster'] if c in plot_df.columns]
+        fig.add_trace(go.Scattermapbox(
+            lat=plot_df['latitude'],
+            lon=plot_df['longitude'],
+            mode='markers',
+            marker=marker,
+            customdata=plot_df[hover_cols].to_numpy() if hover_cols else None,
+            hovertemplate='<br>'.join(f'{c}=%{{customdata[{i}]}}' for i, c in enumerate(hover_cols)) + '<extra></extra>',
+            name='Properties',
+        ))
 
     fig.update_layout(margin={'r':0,'t':40,'l':0,'b':0}, legend=dict(title='Cluster'))
 
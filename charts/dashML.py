@@ -139,6 +139,13 @@ def load_image(image_path):
         return Image.open(full_path)
     return None
 
+def cluster_display_names(cluster_df, prefix='Cluster '):
+    """Nomes dos clusters, usando '<prefix><id>' quando o nome não existe"""
+    fallback = prefix + cluster_df['cluster_id'].astype(str)
+    if 'cluster_name' not in cluster_df.columns:
+        return fallback
+    return cluster_df['cluster_name'].fillna(fallback)
+
 def load_html_file(html_path):
     """Carrega arquivo HTML"""
     full_path = os.path.join(parent_dir, html_path)
@@ -311,11 +318,14 @@ if page == "🏠 Visão Geral":
     st.markdown("### 🎯 Resumo dos 5 Clusters Identificados")
     
     cluster_df = pd.DataFrame(cluster_data)
+    # Nomes resolvidos de uma vez (coluna inteira) e linhas como dicts simples:
+    # evita montar uma Series por linha com iterrows()
+    cluster_df['display_name'] = cluster_display_names(cluster_df)
     
-    for idx, row in cluster_df.iterrows():
-        cluster_id = row['cluster_id']
-        cluster_name = row.get('cluster_name', f'Cluster {cluster_id}')
-        cluster_desc = row.get('cluster_description', '')
+    for row in cluster_df.to_dict('records'):
+        cluster_name = row['display_name']
+        cluster_desc = row.get('cluster_description')
+        cluster_desc = cluster_desc if isinstance(cluster_desc, str) else ''
         
         col_info, col_metrics = st.columns([2, 1])
         
@@ -362,21 +372,21 @@ if page == "🏠 Visão Geral":
             })
         
         metrics_df = pd.DataFrame(metrics_data)
+        # Formato longo: uma única chamada px.bar em vez de um go.Bar por métrica
+        metrics_long = metrics_df.melt(id_vars='Classe', var_name='Métrica', value_name='Valor')
         
-        fig = go.Figure()
-        for metric in ['Precision', 'Recall', 'F1-Score']:
-            fig.add_trace(go.Bar(
-                name=metric,
-                x=metrics_df['Classe'],
-                y=metrics_df[metric],
-                text=metrics_df[metric].apply(lambda x: f'{x:.1%}'),
-                textposition='outside'
-            ))
+        fig = px.bar(
+            metrics_long,
+            x='Classe',
+            y='Valor',
+            color='Métrica',
+            barmode='group'
+        )
+        fig.update_traces(texttemplate='%{y:.1%}', textposition='outside')
         
         fig.update_layout(
             title='Métricas por Classe',
             yaxis_range=[0, 1],
-            barmode='group',
             height=400
         )
         st.plotly_chart(fig, use_container_width=True)
@@ -457,9 +467,9 @@ elif page == "🎯 Clusterização K-Means":
         
         with col1:
             cluster_df = pd.DataFrame(cluster_data)
-            cluster_df['cluster_label'] = cluster_df.apply(
-                lambda x: f"{x.get('cluster_name', f'Cluster {x['cluster_id']}')} ({x['percentual']:.1f}%)", 
-                axis=1
+            cluster_df['cluster_label'] = (
+                cluster_display_names(cluster_df)
+                + ' (' + cluster_df['percentual'].map('{:.1f}'.format) + '%)'
             )
             
             fig = px.pie(
@@ -480,9 +490,10 @@ elif page == "🎯 Clusterização K-Means":
             
             fig2.add_trace(go.Bar(
                 name='Valor/m² (R$)',
-                x=[row.get('cluster_name', f'C{row["cluster_id"]}') for _, row in cluster_df.iterrows()],
+                x=cluster_display_names(cluster_df, prefix='C'),
                 y=cluster_df['valor_m2_mediano'],
-                text=cluster_df['valor_m2_mediano'].apply(lambda x: f'R$ {x:,.0f}'),
+                # Rótulo formatado no navegador (d3-format), sem um f-string por linha
+                texttemplate='R$ %{y:,.0f}',
                 textposition='outside',
                 marker_color='#667eea'
             ))
@@ -491,7 +502,8 @@ elif page == "🎯 Clusterização K-Means":
                 title='Valor Mediano por m² de Cada Cluster',
                 yaxis_title='Valor/m² (R$)',
                 height=500,
-                showlegend=False
+                showlegend=False,
+                separators=',.'  # padrão brasileiro: vírgula decimal, ponto de milhar
             )
             st.plotly_chart(fig2, use_container_width=True)
         
@@ -500,17 +512,30 @@ elif page == "🎯 Clusterização K-Means":
         # Tabela comparativa
         st.markdown("### 📋 Tabela Comparativa dos Clusters")
         
+        # Valores numéricos crus; a formatação fica a cargo do frontend (column_config)
         display_df = pd.DataFrame({
-            'Cluster': [row.get('cluster_name', f'Cluster {row["cluster_id"]}') for _, row in cluster_df.iterrows()],
-            'Imóveis': cluster_df['total_imoveis'].apply(lambda x: f"{x:,}"),
-            '% Total': cluster_df['percentual'].apply(lambda x: f"{x:.1f}%"),
-            'Valor/m²': cluster_df['valor_m2_mediano'].apply(lambda x: f"R$ {x:,.0f}"),
-            'Área (m²)': cluster_df['area_construida_mediana'].apply(lambda x: f"{x:.0f}"),
-            'Ano': cluster_df['ano_construcao_mediano'].apply(lambda x: f"{int(x)}"),
+            'Cluster': cluster_display_names(cluster_df),
+            'Imóveis': cluster_df['total_imoveis'],
+            '% Total': cluster_df['percentual'],
+            # Arredondado aqui: o formato 'localized' agrupa milhares, mas mantém decimais
+            'Valor/m²': cluster_df['valor_m2_mediano'].round().astype(int),
+            'Área (m²)': cluster_df['area_construida_mediana'],
+            'Ano': cluster_df['ano_construcao_mediano'].astype(int),
             'Tipo': cluster_df['tipo_imovel_predominante']
         })
         
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'Imóveis': st.column_config.NumberColumn(format='localized'),
+                '% Total': st.column_config.NumberColumn(format='%.1f%%'),
+                'Valor/m²': st.column_config.NumberColumn('Valor/m² (R$)', format='localized'),
+                'Área (m²)': st.column_config.NumberColumn(format='%.0f'),
+                'Ano': st.column_config.NumberColumn(format='%d'),
+            }
+        )
     
     # Tab 2: Validação
     with tabs[1]:
@@ -805,10 +830,9 @@ elif page == "🔮 Classificação Random Forest":
                 y='Valor',
                 color='Métrica',
                 barmode='group',
-                title='Comparação de Métricas por Classe',
-                text=metrics_df['Valor'].apply(lambda x: f'{x:.1%}')
+                title='Comparação de Métricas por Classe'
             )
-            fig.update_traces(textposition='outside')
+            fig.update_traces(texttemplate='%{y:.1%}', textposition='outside')
             fig.update_layout(yaxis_range=[0, 1], height=400)
             st.plotly_chart(fig, use_container_width=True)
         
@@ -927,11 +951,10 @@ elif page == "🔮 Classificação Random Forest":
             y='feature',
             orientation='h',
             title='Top 10 Features Mais Importantes',
-            text=feat_df['importance'].apply(lambda x: f'{x:.4f}'),
             color='importance',
             color_continuous_scale='Viridis'
         )
-        fig.update_traces(textposition='outside')
+        fig.update_traces(texttemplate='%{x:.4f}', textposition='outside')
         fig.update_layout(
             height=500,
             showlegend=False,
@@ -1350,11 +1373,10 @@ elif page == "🧠 Explicabilidade SHAP":
                 x='Categoria',
                 y='Probabilidade',
                 title='Probabilidades por Categoria',
-                text=prob_df['Probabilidade'].apply(lambda x: f'{x:.1%}'),
                 color='Probabilidade',
                 color_continuous_scale='Viridis'
             )
-            fig_prob.update_traces(textposition='outside')
+            fig_prob.update_traces(texttemplate='%{y:.1%}', textposition='outside')
             fig_prob.update_layout(yaxis_range=[0, 1], height=350, showlegend=False)
             st.plotly_chart(fig_prob, use_container_width=True)
         
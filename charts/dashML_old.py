@@ -11,10 +11,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
+import hashlib
+import inspect
 import os
 import joblib
-from PIL import Image
 import sys
 
 # Adicionar diretório pai ao path para importar módulos
@@ -23,7 +26,15 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from clustering_analysis import get_clustering_data_optimized
-from data_processing import load_and_preprocess_data
+from dashml_constants import (
+    CUSTOM_CSS, PAGE_NAMES, PLOTLY_CONFIG, PLOTLY_STATIC_CONFIG,
+    CLUSTER_DATA, CLASSIFICATION_METRICS, FEAT_NAMES, FEAT_IMP,
+    TEMPORAL_ANOS, TEMPORAL_TRANSACOES, ELBOW_K, ELBOW_INERTIAS,
+    CONFUSION_MATRICES, CLASSES_CURTAS, TRAIN_SIZES_PCT, TRAIN_SCORES,
+    VAL_SCORES, SET3_COLORS, METRIC_CARD_TPL, OVERVIEW_CARDS,
+    CATEGORY_PERFORMANCE, CATEGORY_PERFORMANCE_LONG, SMOTEN_COMPARISON_LONG,
+    GRIDSEARCH_TOP5,
+)
 
 # Configuração da página
 st.set_page_config(
@@ -33,86 +44,120 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS customizado
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        padding: 1rem;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-    }
-    .insight-box {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #1f77b4;
-        margin: 1rem 0;
-    }
-    .section-header {
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #1f77b4;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS customizado (compactado em dashml_constants). Injetado a cada rerun: o
+# Streamlit descarta do front-end os elementos que o rerun não emite, então
+# injetar só na primeira execução da sessão faria os estilos sumirem na
+# primeira interação.
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Header
 st.markdown('<p class="main-header">🤖 Dashboard de Machine Learning</p>', unsafe_allow_html=True)
 st.markdown("### Análise Exploratória Completa do ML Aplicado ao Mercado Imobiliário de Recife")
 
-# Sidebar
-with st.sidebar:
-    st.markdown("---")
-    st.markdown("## 📊 Navegação")
-    page = st.radio(
-        "Selecione a análise:",
-        ["📈 Visão Geral", "🎯 Clustering K-Means", "🔮 Classificação ML", 
-         "⚖️ Análise de Balanceamento", "⚙️ Tuning (GridSearch)", "🧠 Explicabilidade SHAP"]
-    )
-    st.markdown("---")
-    st.info("**Dados:** ITBI Recife 2015-2023\n\n**Total:** 86.006 imóveis residenciais")
-    st.markdown("---")
-    st.markdown("### 🛠️ Tecnologias")
-    st.markdown("""
-    - **K-Means Clustering**
-    - **Random Forest**
-    - **GridSearchCV**
-    - **SHAP Values**
-    - **StandardScaler**
-    - **Streamlit**
-    """)
+# Amostra fixa (semente 42, estratificada por cluster) usada na visualização 3D,
+# salva em disco ao lado do cache de clusterização para não reler as ~86K linhas
+# a cada sessão. Arquivo gerado, fora do git (.gitignore).
+CLUSTERING_CACHE_FILE = os.path.join(parent_dir, 'data', 'clustering_cache.parquet')
+CLUSTERING_SAMPLE_FILE = os.path.join(parent_dir, 'data', 'clustering_sample_5k.parquet')
+CLUSTERING_SAMPLE_SIZE = 5000
+# Únicas colunas que a visualização 3D usa (eixos, cor e hover)
+CLUSTERING_SAMPLE_COLUMNS = [
+    'area_construida', 'area_terreno', 'valor_m2', 'cluster',
+    'bairro', 'tipo_imovel', 'ano_construcao'
+]
+# Chave gravada nos metadados do Parquet da amostra (ver clustering_sample_key)
+CLUSTERING_SAMPLE_KEY_FIELD = b'clustering_sample_key'
 
-@st.cache_data
-def load_clustering_data():
-    """Carrega dados de clusterização usando função otimizada"""
+def sample_clusters(df_clustered):
+    """Amostra estratificada: mesma cota por cluster, para que os clusters
+    pequenos (ex.: Luxury) não fiquem com poucos pontos no gráfico"""
+    por_cluster = CLUSTERING_SAMPLE_SIZE // df_clustered['cluster'].nunique()
+    return pd.concat(
+        grupo.sample(min(por_cluster, len(grupo)), random_state=42)
+        for _, grupo in df_clustered.groupby('cluster')
+    ).reset_index(drop=True)
+
+def clustering_sample_key():
+    """Hash da lógica de amostragem: muda se sample_clusters ou as constantes mudarem"""
+    fonte = inspect.getsource(sample_clusters) + repr((CLUSTERING_SAMPLE_SIZE, CLUSTERING_SAMPLE_COLUMNS))
+    return hashlib.sha256(fonte.encode('utf-8')).hexdigest().encode()
+
+def load_clustering_sample_cache():
+    """Lê a amostra salva em disco, ou None se ausente/desatualizada."""
+    if not os.path.exists(CLUSTERING_SAMPLE_FILE):
+        return None
+    # Invalida se o cache de clusterização foi regerado depois da amostra
+    if (os.path.exists(CLUSTERING_CACHE_FILE)
+            and os.path.getmtime(CLUSTERING_CACHE_FILE) > os.path.getmtime(CLUSTERING_SAMPLE_FILE)):
+        return None
     try:
-        df_clustered, kmeans_model, scaler = get_clustering_data_optimized()
-        if df_clustered is None:
-            st.error("Erro ao carregar dados de clusterização")
-            return None, None
-        
-        # Carregar metadata se existir
-        metadata_path = os.path.join(parent_dir, 'data', 'clustering_metadata.json')
-        metadata = {}
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-        
-        return df_clustered, metadata
+        # Só o esquema (rodapé do arquivo): descarta a amostra sem ler os dados
+        metadata = pq.read_schema(CLUSTERING_SAMPLE_FILE).metadata or {}
+        if metadata.get(CLUSTERING_SAMPLE_KEY_FIELD) != clustering_sample_key():
+            return None
+        return pd.read_parquet(CLUSTERING_SAMPLE_FILE, engine='pyarrow')
+    except Exception as e:
+        print(f"Erro ao carregar amostra de clusterização: {e}")
+        return None
+
+def save_clustering_sample_cache(df_sample):
+    """Grava a amostra com a chave da lógica de amostragem nos metadados."""
+    table = pa.Table.from_pandas(df_sample)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        CLUSTERING_SAMPLE_KEY_FIELD: clustering_sample_key(),
+    })
+    try:
+        pq.write_table(table, CLUSTERING_SAMPLE_FILE, compression='snappy')
+    except OSError as e:
+        print(f"Não foi possível salvar a amostra de clusterização: {e}")
+
+# cache_resource: a amostra é somente leitura, então cada rerun recebe o mesmo
+# objeto, sem a cópia (pickle) que o cache_data faz no retorno. Sem argumentos,
+# há uma única entrada no cache.
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_clustering_sample():
+    """Carrega a amostra dos dados de clusterização usada na visualização 3D"""
+    df_sample = load_clustering_sample_cache()
+    if df_sample is not None:
+        return df_sample
+    try:
+        if os.path.exists(CLUSTERING_CACHE_FILE):
+            # Lê só as colunas necessárias do Parquet, sem decodificar as demais
+            df_clustered = pq.read_table(
+                CLUSTERING_CACHE_FILE, columns=CLUSTERING_SAMPLE_COLUMNS
+            ).to_pandas(self_destruct=True, split_blocks=True)
+        else:
+            df_clustered, _, _ = get_clustering_data_optimized()
+            if df_clustered is None:
+                st.error("Erro ao carregar dados de clusterização")
+                return None
+            df_clustered = df_clustered[CLUSTERING_SAMPLE_COLUMNS]
+        df_sample = sample_clusters(df_clustered)
     except Exception as e:
         st.error(f"Erro ao carregar dados de clusterização: {e}")
-        return None, None
+        return None
+    
+    save_clustering_sample_cache(df_sample)
+    return df_sample
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def load_clustering_metadata():
+    """Carrega o metadata da clusterização, se existir"""
+    metadata_path = os.path.join(parent_dir, 'data', 'clustering_metadata.json')
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def load_gridsearch_metadata():
+    """Carrega o resultado do GridSearch gravado pelo script de deploy, se existir"""
+    metadata_path = os.path.join(parent_dir, 'deploy', 'gridsearch_metadata.json')
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
 
 @st.cache_resource
 def load_clustering_models():
@@ -120,16 +165,11 @@ def load_clustering_models():
     try:
         kmeans_path = os.path.join(parent_dir, 'data', 'kmeans_model.joblib')
         scaler_path = os.path.join(parent_dir, 'data', 'scaler.joblib')
-        metadata_path = os.path.join(parent_dir, 'data', 'clustering_metadata.json')
         
         kmeans = joblib.load(kmeans_path)
         scaler = joblib.load(scaler_path)
         
-        features = []
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            features = metadata.get('features', [])
+        features = load_clustering_metadata().get('features', [])
         
         return kmeans, scaler, features
     except Exception as e:
@@ -212,88 +252,419 @@ def predict_cluster(area, ano, padrao, kmeans, scaler, features):
     
     return cluster_id
 
-@st.cache_data
 def load_summary_data():
-    """Carrega dados resumidos das análises de ML"""
-    
-    # Dados dos clusters baseados no repositório
-    cluster_data = pd.DataFrame({
-        'Cluster': ['Cluster 0: Premium Novos', 'Cluster 1: Econômicos Novos', 
-                   'Cluster 2: Antigos Diversos', 'Cluster 3: Grandes Premium', 
-                   'Cluster 4: Luxury'],
-        'Imóveis': [36935, 19504, 16600, 11210, 1757],
-        'Percentual': [42.9, 22.7, 19.3, 13.0, 2.0],
-        'Valor_m2': [3939, 2729, 2493, 3744, 4171],
-        'Area_Media': [99, 85, 112, 256, 194],
-        'Ano_Medio': [2015, 2013, 1981, 2006, 2013]
+    """Retorna os dados resumidos das análises de ML (constantes de dashml_constants, somente leitura)"""
+    return CLUSTER_DATA, CLASSIFICATION_METRICS
+
+def feature_importance_frame():
+    """Monta o DataFrame de importância das features para os gráficos da página SHAP"""
+    return pd.DataFrame({'Feature': FEAT_NAMES, 'Importância': FEAT_IMP})
+
+@st.cache_data(ttl=60, show_spinner=False)
+def find_png(paths):
+    """Primeiro caminho existente em `paths` (ou None), revalidado a cada 60 s"""
+    return next((p for p in paths if os.path.exists(p)), None)
+
+@st.cache_resource(show_spinner=False)
+def read_png(path):
+    """Lê uma única vez os bytes de um PNG"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def load_png(paths):
+    """Bytes do primeiro PNG existente em `paths`, ou None para usar o fallback"""
+    path = find_png(paths)
+    return None if path is None else read_png(path)
+
+@st.cache_data(show_spinner=False)
+def gridsearch_results():
+    """Simula os resultados do GridSearch (16 combinações) uma única vez por sessão"""
+    # Grade n_estimators × max_depth × min_samples_split × min_samples_leaf
+    # (n varia mais devagar, l mais rápido) e scores numa única chamada ao gerador
+    grid = np.array(np.meshgrid([50, 100], [8, 15], [5, 10], [2, 4], indexing='ij')).reshape(4, -1).T
+    scores = np.random.default_rng(42).uniform(0, 0.06, size=len(grid)) + 0.72
+    scores[np.all(grid == [100, 15, 5, 2], axis=1)] = 0.78  # Melhor combinação
+    
+    # Reformatar para heatmap (float32: metade dos bytes serializados para o navegador):
+    # linhas = n × d, colunas = s × l. O top 5 está congelado em GRIDSEARCH_TOP5
+    return np.asarray(scores, dtype=np.float32).reshape(4, 4)
+
+# Figuras estáticas: montadas uma vez por processo e reaproveitadas a cada
+# rerun (cache_resource devolve o mesmo objeto, sem reconstruir os traces)
+@st.cache_resource(show_spinner=False)
+def fig_cluster_pie():
+    """Pizza com a distribuição percentual dos clusters."""
+    # go.Pie direto: os dados já estão agregados, sem passar pelo px
+    fig = go.Figure(go.Pie(
+        labels=CLUSTER_DATA['Cluster'].to_numpy(),
+        values=CLUSTER_DATA['Percentual'].to_numpy(),
+        marker_colors=SET3_COLORS,
+        hole=0.3
+    ))
+    fig.update_layout(title='Distribuição Percentual dos 5 Clusters K-Means')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_temporal():
+    """Linha com as transações por ano."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=TEMPORAL_ANOS,
+        y=TEMPORAL_TRANSACOES,
+        name='Transações',
+        mode='lines+markers',
+        line=dict(color='#1f77b4', width=3),
+        marker=dict(size=10)
+    ))
+    fig.update_layout(
+        title='Transações por Ano (2015-2023)',
+        xaxis_title='Ano',
+        yaxis_title='Número de Transações',
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_elbow():
+    """Curva de inércia do método do cotovelo."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=ELBOW_K,
+        y=ELBOW_INERTIAS,
+        mode='lines+markers',
+        marker=dict(size=12, color='blue'),
+        line=dict(width=3)
+    ))
+    fig.add_vline(x=5, line_dash="dash", line_color="red", 
+                       annotation_text="K=5 (Cotovelo)", annotation_position="top right")
+    fig.update_layout(
+        title='Inércia vs Número de Clusters (Método do Cotovelo)',
+        xaxis_title='Número de Clusters (K)',
+        yaxis_title='Inércia (Soma das Distâncias Quadradas)',
+        hovermode='x unified',
+        height=400
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_clusters_3d():
+    """Scatter 3D da amostra de clusterização."""
+    fig = px.scatter_3d(
+        load_clustering_sample(),
+        x='area_construida',
+        y='area_terreno',
+        z='valor_m2',
+        color='cluster',
+        hover_data=['bairro', 'tipo_imovel', 'ano_construcao'],
+        title='Clusters K-Means no Espaço Tridimensional',
+        labels={
+            'area_construida': 'Área Construída (m²)',
+            'area_terreno': 'Área do Terreno (m²)',
+            'valor_m2': 'Valor/m² (R$)',
+            'cluster': 'Cluster'
+        },
+        color_continuous_scale='Viridis'
+    )
+    # Marcadores menores: ~5K pontos sobrepostos ficam legíveis e mais leves de desenhar
+    fig.update_traces(marker=dict(size=3))
+    fig.update_layout(height=600)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_cluster_valor_m2():
+    """Barras do valor médio do m² por cluster."""
+    fig = px.bar(
+        CLUSTER_DATA,
+        x='Cluster',
+        y='Valor_m2',
+        color='Valor_m2',
+        color_continuous_scale='Viridis',
+        title='Valor Médio por m² - Comparação entre Clusters',
+        text='Valor_m2'
+    )
+    fig.update_traces(texttemplate='R$ %{text:,.0f}', textposition='outside')
+    fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_cluster_area():
+    """Barras da área média por cluster."""
+    fig = px.bar(
+        CLUSTER_DATA,
+        x='Cluster',
+        y='Area_Media',
+        color='Area_Media',
+        color_continuous_scale='Blues',
+        title='Área Construída Média - Perfil dos Clusters',
+        text='Area_Media'
+    )
+    fig.update_traces(texttemplate='%{text:.0f} m²', textposition='outside')
+    fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_category_performance():
+    """Barras agrupadas de precision/recall/F1 por categoria."""
+    fig = px.bar(
+        CATEGORY_PERFORMANCE_LONG,
+        x='Categoria',
+        y='Score',
+        color='Métrica',
+        barmode='group',
+        title='Métricas Detalhadas por Categoria'
+    )
+    fig.update_layout(yaxis_range=[0, 1], height=400)
+    fig.update_traces(texttemplate='%{y:.0%}', textposition='outside')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_smoten_comparison():
+    """Barras agrupadas das métricas sem balanceamento vs com SMOTEN."""
+    fig = px.bar(
+        SMOTEN_COMPARISON_LONG,
+        x='Configuração',
+        y='Score',
+        color='Métrica',
+        barmode='group',
+        title='Comparação de Performance: Sem Balanceamento vs Com SMOTEN'
+    )
+    fig.update_layout(yaxis_range=[0.7, 0.85], height=400)
+    fig.update_traces(texttemplate='%{y:.1%}', textposition='outside')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_confusion_matrix(nome, classes, title, colorscale, text_size=14, height=350):
+    """Heatmap de uma das matrizes de confusão simuladas (ver CONFUSION_MATRICES)."""
+    z = CONFUSION_MATRICES[nome]
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=classes,
+        y=classes,
+        colorscale=colorscale,
+        texttemplate='%{z}',
+        textfont={"size": text_size},
+        hoverongaps=False
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Predito',
+        yaxis_title='Real',
+        height=height
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_baseline_vs_otimizado():
+    """Barras de acurácia do modelo baseline vs otimizado."""
+    comparison = pd.DataFrame({
+        'Modelo': ['Baseline', 'Otimizado (GridSearch)'],
+        'Acurácia': [0.745, 0.780],
+        'F1-Score': [0.72, 0.75],
+        'Tempo_Treino_min': [0.75, 2.08]
     })
-    
-    # Métricas de classificação do modelo otimizado
-    classification_metrics = {
-        'accuracy': 0.78,
-        'precision_macro': 0.76,
-        'recall_macro': 0.75,
-        'f1_macro': 0.75,
-        'silhouette_score': 0.294
-    }
-    
-    # Importância das features (SHAP)
-    feature_importance = pd.DataFrame({
-        'Feature': ['area_construida', 'area_terreno', 'ano_construcao', 
-                   'cluster', 'bairro_Boa Viagem', 'padrao_acabamento_Alto'],
-        'Importância': [0.32, 0.25, 0.18, 0.12, 0.08, 0.05]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Acurácia',
+        x=comparison['Modelo'],
+        y=comparison['Acurácia'],
+        texttemplate='%{y:.1%}',
+        marker_color=['lightblue', 'darkblue']
+    ))
+    fig.update_layout(
+        title='Baseline vs Otimizado',
+        yaxis_range=[0.7, 0.85],
+        yaxis_title='Acurácia',
+        height=400
+    )
+    fig.update_traces(textposition='outside')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_learning_curves():
+    """Curvas de aprendizado (treino e validação)."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=TRAIN_SIZES_PCT,
+        y=TRAIN_SCORES,
+        name='Treino',
+        mode='lines+markers',
+        line=dict(color='blue', width=3),
+        marker=dict(size=10)
+    ))
+    fig.add_trace(go.Scatter(
+        x=TRAIN_SIZES_PCT,
+        y=VAL_SCORES,
+        name='Validação',
+        mode='lines+markers',
+        line=dict(color='red', width=3),
+        marker=dict(size=10)
+    ))
+
+    fig.update_layout(
+        title='Learning Curves - Convergência do Modelo Random Forest',
+        xaxis_title='Tamanho do Dataset de Treino (%)',
+        yaxis_title='Acurácia',
+        yaxis_range=[0.45, 0.85],
+        hovermode='x unified',
+        height=500
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_class_distribution():
+    """Barras da distribuição original das classes."""
+    class_distribution = pd.DataFrame({
+        'Categoria': ['Econômico', 'Médio', 'Alto Valor'],
+        'Quantidade': [28250, 29000, 28756],
+        'Percentual': [32.8, 33.7, 33.4]
     })
-    
-    # Dados temporais
-    years = list(range(2015, 2024))
-    temporal_data = pd.DataFrame({
-        'Ano': years,
-        'Transacoes': [8500, 9200, 10500, 11200, 9800, 10100, 9500, 8900, 8300],
-        'Valor_Medio_m2': [2800, 2950, 3100, 3250, 3400, 3550, 3700, 3850, 4000]
+
+    fig = px.bar(
+        class_distribution,
+        x='Categoria',
+        y='Percentual',
+        title='Distribuição das Classes (Dataset Original)',
+        color='Categoria',
+        color_discrete_sequence=['#3498db', '#e74c3c', '#2ecc71']
+    )
+    fig.update_traces(texttemplate='%{y:.1f}%', textposition='outside')
+    fig.update_layout(yaxis_range=[0, 40], showlegend=False)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_gridsearch_heatmap():
+    """Heatmap da acurácia CV das 16 combinações do GridSearch."""
+    heatmap_data = gridsearch_results()
+    # Rótulos formatados direto de z: dispensa enviar uma segunda matriz em `text`
+    fig = go.Figure(data=go.Heatmap(
+        z=heatmap_data,
+        x=['s=5, l=2', 's=5, l=4', 's=10, l=2', 's=10, l=4'],
+        y=['n=50, d=8', 'n=50, d=15', 'n=100, d=8', 'n=100, d=15'],
+        colorscale='Viridis',
+        texttemplate='%{z:.1%}',
+        textfont={"size": 10},
+        colorbar=dict(title="Acurácia CV")
+    ))
+    fig.update_layout(
+        title='Acurácia de Validação Cruzada para Cada Combinação de Hiperparâmetros',
+        xaxis_title='min_samples_split (s) × min_samples_leaf (l)',
+        yaxis_title='n_estimators (n) × max_depth (d)',
+        height=500
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_tradeoff():
+    """Barras de acurácia com a linha de tempo de treino em eixo secundário."""
+    tradeoff_data = pd.DataFrame({
+        'Configuração': ['Baseline\n(n=50, d=8)', 'Intermediário\n(n=75, d=12)', 
+                        'Otimizado\n(n=100, d=15)'],
+        'Acurácia': [0.745, 0.765, 0.780],
+        'Tempo_Treino_min': [0.75, 1.35, 2.08]
     })
-    
-    return cluster_data, classification_metrics, feature_importance, temporal_data
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Bar(name='Acurácia', x=tradeoff_data['Configuração'], 
+               y=tradeoff_data['Acurácia'],
+               texttemplate='%{y:.1%}',
+               textposition='outside',
+               marker_color='#3498db'),
+        secondary_y=False
+    )
+    fig.add_trace(
+        go.Scatter(name='Tempo (min)', x=tradeoff_data['Configuração'], 
+                   y=tradeoff_data['Tempo_Treino_min'],
+                   mode='lines+markers',
+                   line=dict(color='#e74c3c', width=3),
+                   marker=dict(size=12)),
+        secondary_y=True
+    )
+    fig.update_layout(
+        title='Trade-off entre Acurácia e Tempo de Treinamento',
+        height=500
+    )
+    fig.update_yaxes(title_text="Acurácia", range=[0.7, 0.85], secondary_y=False)
+    fig.update_yaxes(title_text="Tempo (minutos)", secondary_y=True)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_param_importance(coluna, title, colorscale, texttemplate):
+    """Barras do impacto relativo de cada hiperparâmetro (acurácia ou tempo)."""
+    param_importance = pd.DataFrame({
+        'Hiperparâmetro': ['n_estimators', 'max_depth', 'min_samples_split', 'min_samples_leaf'],
+        'Impacto_Acurácia': [0.025, 0.020, 0.008, 0.005],
+        'Impacto_Tempo': [0.60, 0.25, 0.10, 0.05]
+    })
+
+    fig = px.bar(
+        param_importance,
+        x='Hiperparâmetro',
+        y=coluna,
+        title=title,
+        text=coluna,
+        color=coluna,
+        color_continuous_scale=colorscale
+    )
+    fig.update_traces(texttemplate=texttemplate, textposition='outside')
+    fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_shap_importance():
+    """Barras horizontais de importância das features (fallback da imagem SHAP)."""
+    fig = px.bar(
+        feature_importance_frame(),
+        x='Importância',
+        y='Feature',
+        orientation='h',
+        title='Features Mais Importantes (SHAP Values)',
+        color='Importância',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(yaxis={'categoryorder':'total ascending'}, height=400)
+    fig.update_traces(texttemplate='%{x:.0%}', textposition='outside')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def fig_shap_by_class():
+    """Barras agrupadas do impacto SHAP por categoria (fallback da imagem multiclasse)."""
+    features_list = list(FEAT_NAMES)
+    categories = ['Econômico', 'Médio', 'Alto Valor']
+    
+    shap_by_class = pd.DataFrame({
+        'Feature': features_list * 3,
+        'Categoria': sum([[cat] * len(features_list) for cat in categories], []),
+        'SHAP_Value': [
+            -0.15, -0.10, -0.08, 0.05, -0.12, -0.06,  # Econômico
+            0.02, 0.01, 0.03, 0.08, 0.02, 0.01,       # Médio
+            0.25, 0.20, 0.15, 0.12, 0.18, 0.10        # Alto Valor
+        ]
+    })
+
+    fig = px.bar(
+        shap_by_class,
+        x='Feature',
+        y='SHAP_Value',
+        color='Categoria',
+        barmode='group',
+        title='Impacto Médio das Features por Categoria (SHAP)',
+        labels={'SHAP_Value': 'SHAP Value (impacto médio)'}
+    )
+    fig.update_xaxes(tickangle=-45)
+    fig.update_layout(height=380)
+    return fig
 
 # Carregar dados
-cluster_data, class_metrics, feat_importance, temporal_data = load_summary_data()
-df_clustered, metadata = load_clustering_data()
+cluster_data, class_metrics = load_summary_data()
 
 # ==================== PÁGINA 1: VISÃO GERAL ====================
-if page == "📈 Visão Geral":
+def render_visao_geral():
+    """Página de visão geral do projeto de ML."""
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h2>86.006</h2>
-            <p>Imóveis Analisados</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h2>5</h2>
-            <p>Clusters Identificados</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <h2>78%</h2>
-            <p>Acurácia do Modelo</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="metric-card">
-            <h2>0.294</h2>
-            <p>Silhouette Score</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, (valor, rotulo) in zip(st.columns(4), OVERVIEW_CARDS):
+        col.markdown(METRIC_CARD_TPL.format(valor=valor, rotulo=rotulo), unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -327,33 +698,10 @@ if page == "📈 Visão Geral":
     
     with col_right:
         st.markdown("### 📊 Distribuição dos Clusters")
-        fig_pie = px.pie(
-            cluster_data, 
-            values='Percentual', 
-            names='Cluster',
-            title='Distribuição Percentual dos 5 Clusters K-Means',
-            color_discrete_sequence=px.colors.qualitative.Set3,
-            hole=0.3
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(fig_cluster_pie(), use_container_width=True, config=PLOTLY_CONFIG)
         
         st.markdown("### 📈 Evolução Temporal")
-        fig_temporal = go.Figure()
-        fig_temporal.add_trace(go.Scatter(
-            x=temporal_data['Ano'], 
-            y=temporal_data['Transacoes'],
-            name='Transações',
-            mode='lines+markers',
-            line=dict(color='#1f77b4', width=3),
-            marker=dict(size=10)
-        ))
-        fig_temporal.update_layout(
-            title='Transações por Ano (2015-2023)',
-            xaxis_title='Ano',
-            yaxis_title='Número de Transações',
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig_temporal, use_container_width=True)
+        st.plotly_chart(fig_temporal(), use_container_width=True, config=PLOTLY_STATIC_CONFIG)
     
     st.markdown("---")
     st.markdown("### 💡 Principais Descobertas do ML")
@@ -388,7 +736,8 @@ if page == "📈 Visão Geral":
         """, unsafe_allow_html=True)
 
 # ==================== PÁGINA 2: CLUSTERING K-MEANS ====================
-elif page == "🎯 Clustering K-Means":
+def render_clustering():
+    """Página da segmentação com K-Means."""
     
     st.markdown("## Segmentação Inteligente com K-Means")
     
@@ -408,28 +757,7 @@ elif page == "🎯 Clustering K-Means":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Simular dados do método do cotovelo
-        k_range = range(2, 11)
-        inertias = [45000, 32000, 24000, 19000, 16000, 14500, 13800, 13400, 13100]
-        
-        fig_elbow = go.Figure()
-        fig_elbow.add_trace(go.Scatter(
-            x=list(k_range),
-            y=inertias,
-            mode='lines+markers',
-            marker=dict(size=12, color='blue'),
-            line=dict(width=3)
-        ))
-        fig_elbow.add_vline(x=5, line_dash="dash", line_color="red", 
-                           annotation_text="K=5 (Cotovelo)", annotation_position="top right")
-        fig_elbow.update_layout(
-            title='Inércia vs Número de Clusters (Método do Cotovelo)',
-            xaxis_title='Número de Clusters (K)',
-            yaxis_title='Inércia (Soma das Distâncias Quadradas)',
-            hovermode='x unified',
-            height=400
-        )
-        st.plotly_chart(fig_elbow, use_container_width=True)
+        st.plotly_chart(fig_elbow(), use_container_width=True, config=PLOTLY_STATIC_CONFIG)
     
     with col2:
         st.markdown("""
@@ -447,71 +775,39 @@ elif page == "🎯 Clustering K-Means":
     # Visualização 3D dos Clusters
     st.markdown("### 🌐 Visualização 3D dos Clusters no Espaço de Features")
     
-    if df_clustered is not None:
+    # Carregado só nesta página: as demais não tocam nos dados de clusterização
+    df_sample = load_clustering_sample()
+    if df_sample is not None:
         # Criar visualização 3D
-        fig_3d = px.scatter_3d(
-            df_clustered.sample(min(5000, len(df_clustered)), random_state=42),
-            x='area_construida',
-            y='area_terreno',
-            z='valor_m2',
-            color='cluster',
-            hover_data=['bairro', 'tipo_imovel', 'ano_construcao'],
-            title='Clusters K-Means no Espaço Tridimensional',
-            labels={
-                'area_construida': 'Área Construída (m²)',
-                'area_terreno': 'Área do Terreno (m²)',
-                'valor_m2': 'Valor/m² (R$)',
-                'cluster': 'Cluster'
-            },
-            color_continuous_scale='Viridis'
-        )
-        fig_3d.update_layout(height=600)
-        st.plotly_chart(fig_3d, use_container_width=True)
+        st.plotly_chart(fig_clusters_3d(), use_container_width=True, config=PLOTLY_CONFIG)
     
     st.markdown("---")
     
     # Análise Detalhada dos Clusters
     st.markdown("### 📊 Análise Detalhada de Cada Cluster")
     
-    cluster_display = cluster_data.copy()
-    cluster_display['Valor_m2'] = cluster_display['Valor_m2'].apply(lambda x: f"R$ {x:,.0f}")
-    cluster_display['Area_Media'] = cluster_display['Area_Media'].apply(lambda x: f"{x:.0f} m²")
-    cluster_display['Percentual'] = cluster_display['Percentual'].apply(lambda x: f"{x:.1f}%")
-    cluster_display['Imóveis'] = cluster_display['Imóveis'].apply(lambda x: f"{x:,}")
-    
-    st.dataframe(cluster_display, use_container_width=True, hide_index=True)
+    # Valores numéricos crus; a formatação fica a cargo do frontend (column_config)
+    st.dataframe(
+        cluster_data,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Imóveis': st.column_config.NumberColumn(format='localized'),
+            'Percentual': st.column_config.NumberColumn(format='%.1f%%'),
+            'Valor_m2': st.column_config.NumberColumn('Valor_m2 (R$)', format='localized'),
+            'Area_Media': st.column_config.NumberColumn(format='%.0f m²'),
+        }
+    )
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 💰 Valor m² por Cluster")
-        fig_bar = px.bar(
-            cluster_data,
-            x='Cluster',
-            y='Valor_m2',
-            color='Valor_m2',
-            color_continuous_scale='Viridis',
-            title='Valor Médio por m² - Comparação entre Clusters',
-            text='Valor_m2'
-        )
-        fig_bar.update_traces(texttemplate='R$ %{text:,.0f}', textposition='outside')
-        fig_bar.update_layout(showlegend=False, xaxis_tickangle=-45)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(fig_cluster_valor_m2(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("### 📏 Área Média por Cluster")
-        fig_area = px.bar(
-            cluster_data,
-            x='Cluster',
-            y='Area_Media',
-            color='Area_Media',
-            color_continuous_scale='Blues',
-            title='Área Construída Média - Perfil dos Clusters',
-            text='Area_Media'
-        )
-        fig_area.update_traces(texttemplate='%{text:.0f} m²', textposition='outside')
-        fig_area.update_layout(showlegend=False, xaxis_tickangle=-45)
-        st.plotly_chart(fig_area, use_container_width=True)
+        st.plotly_chart(fig_cluster_area(), use_container_width=True, config=PLOTLY_CONFIG)
     
     # Insights dos clusters
     st.markdown("### 💡 Características Principais dos Clusters")
@@ -584,7 +880,8 @@ elif page == "🎯 Clustering K-Means":
         """, unsafe_allow_html=True)
 
 # ==================== PÁGINA 3: CLASSIFICAÇÃO ML ====================
-elif page == "🔮 Classificação ML":
+def render_classificacao():
+    """Página do modelo de classificação Random Forest."""
     
     st.markdown("## Modelo de Classificação Random Forest Otimizado")
     
@@ -621,33 +918,11 @@ elif page == "🔮 Classificação ML":
         st.markdown("### 🎯 Matriz de Confusão")
         
         # Matriz de confusão simulada baseada nas métricas
-        confusion_matrix = np.array([
-            [1250, 180, 70],
-            [150, 1400, 200],
-            [50, 170, 1330]
-        ])
-        
-        classes = ['Econômico', 'Médio', 'Alto Valor']
-        
-        fig_cm = go.Figure(data=go.Heatmap(
-            z=confusion_matrix,
-            x=classes,
-            y=classes,
-            colorscale='Blues',
-            text=confusion_matrix,
-            texttemplate='%{text}',
-            textfont={"size": 16},
-            hoverongaps=False
-        ))
-        
-        fig_cm.update_layout(
-            title='Matriz de Confusão - Conjunto de Teste',
-            xaxis_title='Predito',
-            yaxis_title='Real',
-            height=400
+        fig_cm = fig_confusion_matrix(
+            'original', ('Econômico', 'Médio', 'Alto Valor'),
+            'Matriz de Confusão - Conjunto de Teste', 'Blues', text_size=16, height=400
         )
-        
-        st.plotly_chart(fig_cm, use_container_width=True)
+        st.plotly_chart(fig_cm, use_container_width=True, config=PLOTLY_CONFIG)
         
         st.markdown("""
         <div class="insight-box">
@@ -669,34 +944,9 @@ elif page == "🔮 Classificação ML":
     with col_right:
         st.markdown("### 📈 Performance por Categoria")
         
-        category_performance = pd.DataFrame({
-            'Categoria': ['Econômico', 'Médio', 'Alto Valor'],
-            'Precision': [0.83, 0.75, 0.86],
-            'Recall': [0.81, 0.80, 0.78],
-            'F1-Score': [0.82, 0.77, 0.82],
-            'Suporte': [1500, 1750, 1550]
-        })
+        st.plotly_chart(fig_category_performance(), use_container_width=True, config=PLOTLY_CONFIG)
         
-        fig_cat = go.Figure()
-        for metric in ['Precision', 'Recall', 'F1-Score']:
-            fig_cat.add_trace(go.Bar(
-                name=metric,
-                x=category_performance['Categoria'],
-                y=category_performance[metric],
-                text=category_performance[metric].apply(lambda x: f'{x:.0%}')
-            ))
-        
-        fig_cat.update_layout(
-            title='Métricas Detalhadas por Categoria',
-            barmode='group',
-            yaxis_range=[0, 1],
-            yaxis_title='Score',
-            height=400
-        )
-        fig_cat.update_traces(textposition='outside')
-        st.plotly_chart(fig_cat, use_container_width=True)
-        
-        st.dataframe(category_performance, use_container_width=True, hide_index=True)
+        st.dataframe(CATEGORY_PERFORMANCE, use_container_width=True, hide_index=True)
     
     st.markdown("---")
     
@@ -706,29 +956,7 @@ elif page == "🔮 Classificação ML":
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        comparison = pd.DataFrame({
-            'Modelo': ['Baseline', 'Otimizado (GridSearch)'],
-            'Acurácia': [0.745, 0.780],
-            'F1-Score': [0.72, 0.75],
-            'Tempo_Treino_min': [0.75, 2.08]
-        })
-        
-        fig_comp = go.Figure()
-        fig_comp.add_trace(go.Bar(
-            name='Acurácia',
-            x=comparison['Modelo'],
-            y=comparison['Acurácia'],
-            text=comparison['Acurácia'].apply(lambda x: f'{x:.1%}'),
-            marker_color=['lightblue', 'darkblue']
-        ))
-        fig_comp.update_layout(
-            title='Baseline vs Otimizado',
-            yaxis_range=[0.7, 0.85],
-            yaxis_title='Acurácia',
-            height=400
-        )
-        fig_comp.update_traces(textposition='outside')
-        st.plotly_chart(fig_comp, use_container_width=True)
+        st.plotly_chart(fig_baseline_vs_otimizado(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("""
@@ -750,38 +978,7 @@ elif page == "🔮 Classificação ML":
     # Curva de aprendizado
     st.markdown("### 📈 Curvas de Aprendizado")
     
-    train_sizes = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
-    train_scores = 0.55 + 0.25 * (1 - np.exp(-5 * train_sizes))
-    val_scores = 0.50 + 0.28 * (1 - np.exp(-3 * train_sizes)) - 0.05 * train_sizes
-    
-    fig_learning = go.Figure()
-    fig_learning.add_trace(go.Scatter(
-        x=train_sizes * 100,
-        y=train_scores,
-        name='Treino',
-        mode='lines+markers',
-        line=dict(color='blue', width=3),
-        marker=dict(size=10)
-    ))
-    fig_learning.add_trace(go.Scatter(
-        x=train_sizes * 100,
-        y=val_scores,
-        name='Validação',
-        mode='lines+markers',
-        line=dict(color='red', width=3),
-        marker=dict(size=10)
-    ))
-    
-    fig_learning.update_layout(
-        title='Learning Curves - Convergência do Modelo Random Forest',
-        xaxis_title='Tamanho do Dataset de Treino (%)',
-        yaxis_title='Acurácia',
-        yaxis_range=[0.45, 0.85],
-        hovermode='x unified',
-        height=500
-    )
-    
-    st.plotly_chart(fig_learning, use_container_width=True)
+    st.plotly_chart(fig_learning_curves(), use_container_width=True, config=PLOTLY_CONFIG)
     
     st.markdown("""
     <div class="insight-box">
@@ -794,7 +991,8 @@ elif page == "🔮 Classificação ML":
     """, unsafe_allow_html=True)
 
 # ==================== PÁGINA 4: ANÁLISE DE BALANCEAMENTO ====================
-elif page == "⚖️ Análise de Balanceamento":
+def render_balanceamento():
+    """Página da análise de balanceamento (SMOTEN)."""
     
     st.markdown("## SMOTEN: Por Que NÃO Foi Necessário")
     
@@ -815,24 +1013,7 @@ elif page == "⚖️ Análise de Balanceamento":
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        class_distribution = pd.DataFrame({
-            'Categoria': ['Econômico', 'Médio', 'Alto Valor'],
-            'Quantidade': [28250, 29000, 28756],
-            'Percentual': [32.8, 33.7, 33.4]
-        })
-        
-        fig_dist = px.bar(
-            class_distribution,
-            x='Categoria',
-            y='Percentual',
-            title='Distribuição das Classes (Dataset Original)',
-            text='Percentual',
-            color='Categoria',
-            color_discrete_sequence=['#3498db', '#e74c3c', '#2ecc71']
-        )
-        fig_dist.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-        fig_dist.update_layout(yaxis_range=[0, 40], showlegend=False)
-        st.plotly_chart(fig_dist, use_container_width=True)
+        st.plotly_chart(fig_class_distribution(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("""
@@ -867,35 +1048,7 @@ elif page == "⚖️ Análise de Balanceamento":
     col1, col2 = st.columns(2)
     
     with col1:
-        comparison_smoten = pd.DataFrame({
-            'Configuração': ['Sem Balanceamento', 'Com SMOTEN'],
-            'Acurácia': [0.78, 0.76],
-            'Precision': [0.76, 0.74],
-            'Recall': [0.75, 0.75],
-            'F1-Score': [0.75, 0.74],
-            'Tempo_Treino': [2.08, 3.45]
-        })
-        
-        fig_comp = go.Figure()
-        
-        metrics = ['Acurácia', 'Precision', 'Recall', 'F1-Score']
-        for metric in metrics:
-            fig_comp.add_trace(go.Bar(
-                name=metric,
-                x=comparison_smoten['Configuração'],
-                y=comparison_smoten[metric],
-                text=comparison_smoten[metric].apply(lambda x: f'{x:.1%}')
-            ))
-        
-        fig_comp.update_layout(
-            title='Comparação de Performance: Sem Balanceamento vs Com SMOTEN',
-            barmode='group',
-            yaxis_range=[0.7, 0.85],
-            yaxis_title='Score',
-            height=400
-        )
-        fig_comp.update_traces(textposition='outside')
-        st.plotly_chart(fig_comp, use_container_width=True)
+        st.plotly_chart(fig_smoten_comparison(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("""
@@ -925,46 +1078,13 @@ elif page == "⚖️ Análise de Balanceamento":
     
     with col_a:
         st.markdown("#### Sem Balanceamento (Melhor)")
-        confusion_original = np.array([[1250, 180, 70], [150, 1400, 200], [50, 170, 1330]])
-        classes = ['Econômico', 'Médio', 'Alto']
-        
-        fig_cm1 = go.Figure(data=go.Heatmap(
-            z=confusion_original,
-            x=classes,
-            y=classes,
-            colorscale='Blues',
-            text=confusion_original,
-            texttemplate='%{text}',
-            textfont={"size": 14}
-        ))
-        fig_cm1.update_layout(
-            title='Sem Balanceamento',
-            xaxis_title='Predito',
-            yaxis_title='Real',
-            height=350
-        )
-        st.plotly_chart(fig_cm1, use_container_width=True)
+        fig_cm1 = fig_confusion_matrix('original', CLASSES_CURTAS, 'Sem Balanceamento', 'Blues')
+        st.plotly_chart(fig_cm1, use_container_width=True, config=PLOTLY_CONFIG)
     
     with col_b:
         st.markdown("#### Com SMOTEN (Pior)")
-        confusion_smoten = np.array([[1180, 220, 100], [200, 1350, 200], [80, 220, 1250]])
-        
-        fig_cm2 = go.Figure(data=go.Heatmap(
-            z=confusion_smoten,
-            x=classes,
-            y=classes,
-            colorscale='Reds',
-            text=confusion_smoten,
-            texttemplate='%{text}',
-            textfont={"size": 14}
-        ))
-        fig_cm2.update_layout(
-            title='Com SMOTEN',
-            xaxis_title='Predito',
-            yaxis_title='Real',
-            height=350
-        )
-        st.plotly_chart(fig_cm2, use_container_width=True)
+        fig_cm2 = fig_confusion_matrix('smoten', CLASSES_CURTAS, 'Com SMOTEN', 'Reds')
+        st.plotly_chart(fig_cm2, use_container_width=True, config=PLOTLY_CONFIG)
     
     st.markdown("""
     <div class="insight-box">
@@ -997,7 +1117,8 @@ elif page == "⚖️ Análise de Balanceamento":
     st.info("💡 **Quando usar SMOTEN?** Apenas com desbalanceamento severo (classe < 20%, ratio > 3:1). Nosso caso: perfeitamente balanceado (33/33/33%).")
 
 # ==================== PÁGINA 5: TUNING (GRIDSEARCH) ====================
-elif page == "⚙️ Tuning (GridSearch)":
+def render_tuning():
+    """Página da otimização de hiperparâmetros (GridSearchCV)."""
     
     st.markdown("## Otimização de Hiperparâmetros com GridSearchCV")
     
@@ -1032,13 +1153,15 @@ elif page == "⚙️ Tuning (GridSearch)":
         
         st.dataframe(param_space, use_container_width=True, hide_index=True)
         
-        st.markdown("""
+        # Tempo medido na última execução do GridSearch (2.08 min na execução original)
+        tempo_gridsearch = load_gridsearch_metadata().get('tempo_minutos', 2.08)
+        st.markdown(f"""
         <div class="insight-box">
         <b>📊 Combinações Testadas:</b><br>
         • Total: 2 × 2 × 2 × 2 = <b>16 combinações</b><br>
         • Validação: 3-fold CV para cada combinação<br>
         • Total de treinos: 16 × 3 = <b>48 modelos treinados</b><br>
-        • Tempo total: ~2.08 minutos
+        • Tempo total: ~{tempo_gridsearch:.2f} minutos
         </div>
         """, unsafe_allow_html=True)
     
@@ -1073,48 +1196,7 @@ elif page == "⚙️ Tuning (GridSearch)":
     # Heatmap de Resultados do GridSearch
     st.markdown("### 🌡️ Heatmap dos Resultados do GridSearch")
     
-    # Simular resultados de GridSearch (16 combinações)
-    np.random.seed(42)
-    combinations = []
-    scores = []
-    
-    for n_est in [50, 100]:
-        for max_d in [8, 15]:
-            for min_split in [5, 10]:
-                for min_leaf in [2, 4]:
-                    score = 0.72 + np.random.uniform(0, 0.06)
-                    if n_est == 100 and max_d == 15 and min_split == 5 and min_leaf == 2:
-                        score = 0.78  # Melhor combinação
-                    combinations.append(f"n={n_est}, d={max_d}, s={min_split}, l={min_leaf}")
-                    scores.append(score)
-    
-    results_df = pd.DataFrame({
-        'Combinação': combinations,
-        'Acurácia_CV': scores
-    })
-    
-    # Reformatar para heatmap
-    heatmap_data = np.array(scores).reshape(4, 4)
-    
-    fig_heatmap = go.Figure(data=go.Heatmap(
-        z=heatmap_data,
-        x=[f'Comb {i+1}' for i in range(4)],
-        y=[f'Grupo {i+1}' for i in range(4)],
-        colorscale='Viridis',
-        text=np.round(heatmap_data, 3),
-        texttemplate='%{text:.1%}',
-        textfont={"size": 10},
-        colorbar=dict(title="Acurácia CV")
-    ))
-    
-    fig_heatmap.update_layout(
-        title='Acurácia de Validação Cruzada para Cada Combinação de Hiperparâmetros',
-        xaxis_title='Configurações',
-        yaxis_title='Grupos de Teste',
-        height=500
-    )
-    
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    st.plotly_chart(fig_gridsearch_heatmap(), use_container_width=True, config=PLOTLY_CONFIG)
     
     st.markdown("""
     <div class="insight-box">
@@ -1131,11 +1213,7 @@ elif page == "⚙️ Tuning (GridSearch)":
     # Top 5 Melhores Combinações
     st.markdown("### 🏆 Top 5 Melhores Combinações de Hiperparâmetros")
     
-    results_sorted = results_df.sort_values('Acurácia_CV', ascending=False).head(5).reset_index(drop=True)
-    results_sorted.index = results_sorted.index + 1
-    results_sorted['Acurácia_CV'] = results_sorted['Acurácia_CV'].apply(lambda x: f'{x:.2%}')
-    
-    st.dataframe(results_sorted, use_container_width=True)
+    st.dataframe(GRIDSEARCH_TOP5, use_container_width=True)
     
     col1, col2 = st.columns(2)
     
@@ -1167,41 +1245,7 @@ elif page == "⚙️ Tuning (GridSearch)":
     # Trade-off Tempo vs Performance
     st.markdown("### ⏱️ Trade-off: Tempo de Treino vs Performance")
     
-    tradeoff_data = pd.DataFrame({
-        'Configuração': ['Baseline\n(n=50, d=8)', 'Intermediário\n(n=75, d=12)', 
-                        'Otimizado\n(n=100, d=15)'],
-        'Acurácia': [0.745, 0.765, 0.780],
-        'Tempo_Treino_min': [0.75, 1.35, 2.08]
-    })
-    
-    fig_tradeoff = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    fig_tradeoff.add_trace(
-        go.Bar(name='Acurácia', x=tradeoff_data['Configuração'], 
-               y=tradeoff_data['Acurácia'],
-               text=tradeoff_data['Acurácia'].apply(lambda x: f'{x:.1%}'),
-               textposition='outside',
-               marker_color='#3498db'),
-        secondary_y=False
-    )
-    
-    fig_tradeoff.add_trace(
-        go.Scatter(name='Tempo (min)', x=tradeoff_data['Configuração'], 
-                   y=tradeoff_data['Tempo_Treino_min'],
-                   mode='lines+markers',
-                   line=dict(color='#e74c3c', width=3),
-                   marker=dict(size=12)),
-        secondary_y=True
-    )
-    
-    fig_tradeoff.update_layout(
-        title='Trade-off entre Acurácia e Tempo de Treinamento',
-        height=500
-    )
-    fig_tradeoff.update_yaxes(title_text="Acurácia", range=[0.7, 0.85], secondary_y=False)
-    fig_tradeoff.update_yaxes(title_text="Tempo (minutos)", secondary_y=True)
-    
-    st.plotly_chart(fig_tradeoff, use_container_width=True)
+    st.plotly_chart(fig_tradeoff(), use_container_width=True, config=PLOTLY_CONFIG)
     
     st.markdown("""
     <div class="insight-box">
@@ -1218,41 +1262,19 @@ elif page == "⚙️ Tuning (GridSearch)":
     # Importância dos Hiperparâmetros
     st.markdown("### 📊 Importância Relativa dos Hiperparâmetros")
     
-    param_importance = pd.DataFrame({
-        'Hiperparâmetro': ['n_estimators', 'max_depth', 'min_samples_split', 'min_samples_leaf'],
-        'Impacto_Acurácia': [0.025, 0.020, 0.008, 0.005],
-        'Impacto_Tempo': [0.60, 0.25, 0.10, 0.05]
-    })
-    
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_imp_acc = px.bar(
-            param_importance,
-            x='Hiperparâmetro',
-            y='Impacto_Acurácia',
-            title='Impacto na Acurácia',
-            text='Impacto_Acurácia',
-            color='Impacto_Acurácia',
-            color_continuous_scale='Blues'
+        st.plotly_chart(
+            fig_param_importance('Impacto_Acurácia', 'Impacto na Acurácia', 'Blues', '%{text:.1%}'),
+            use_container_width=True, config=PLOTLY_CONFIG
         )
-        fig_imp_acc.update_traces(texttemplate='%{text:.1%}', textposition='outside')
-        fig_imp_acc.update_layout(showlegend=False, xaxis_tickangle=-45)
-        st.plotly_chart(fig_imp_acc, use_container_width=True)
     
     with col2:
-        fig_imp_time = px.bar(
-            param_importance,
-            x='Hiperparâmetro',
-            y='Impacto_Tempo',
-            title='Impacto no Tempo de Treino',
-            text='Impacto_Tempo',
-            color='Impacto_Tempo',
-            color_continuous_scale='Reds'
+        st.plotly_chart(
+            fig_param_importance('Impacto_Tempo', 'Impacto no Tempo de Treino', 'Reds', '%{text:.0%}'),
+            use_container_width=True, config=PLOTLY_CONFIG
         )
-        fig_imp_time.update_traces(texttemplate='%{text:.0%}', textposition='outside')
-        fig_imp_time.update_layout(showlegend=False, xaxis_tickangle=-45)
-        st.plotly_chart(fig_imp_time, use_container_width=True)
     
     st.markdown("""
     <div class="insight-box">
@@ -1265,7 +1287,8 @@ elif page == "⚙️ Tuning (GridSearch)":
     """, unsafe_allow_html=True)
 
 # ==================== PÁGINA 6: EXPLICABILIDADE SHAP ====================
-elif page == "🧠 Explicabilidade SHAP":
+def render_shap():
+    """Página de explicabilidade com SHAP."""
     
     st.markdown("## Explicabilidade com SHAP (SHapley Additive exPlanations)")
     
@@ -1288,45 +1311,12 @@ elif page == "🧠 Explicabilidade SHAP":
     
     with col1:
         # Carregar imagem SHAP se existir
-        if os.path.exists('docs/shap_summary_bar.png'):
-            try:
-                img = Image.open('docs/shap_summary_bar.png')
-                st.image(img, caption='Feature Importance Global (SHAP)', width=500)
-            except:
-                st.warning("Imagem não encontrada em docs/")
-        elif os.path.exists('shap_summary_bar.png'):
-            try:
-                img = Image.open('shap_summary_bar.png')
-                st.image(img, caption='Feature Importance Global (SHAP)', width=500)
-            except:
-                # Fallback para gráfico Plotly
-                fig_shap = px.bar(
-                    feat_importance,
-                    x='Importância',
-                    y='Feature',
-                    orientation='h',
-                    title='Features Mais Importantes (SHAP Values)',
-                    color='Importância',
-                    color_continuous_scale='Viridis',
-                    text=feat_importance['Importância'].apply(lambda x: f'{x:.0%}')
-                )
-                fig_shap.update_layout(yaxis={'categoryorder':'total ascending'}, height=400)
-                fig_shap.update_traces(textposition='outside')
-                st.plotly_chart(fig_shap, use_container_width=True)
+        img = load_png(('docs/shap_summary_bar.png', 'shap_summary_bar.png'))
+        if img is not None:
+            st.image(img, caption='Feature Importance Global (SHAP)', width=500)
         else:
-            fig_shap = px.bar(
-                feat_importance,
-                x='Importância',
-                y='Feature',
-                orientation='h',
-                title='Features Mais Importantes (SHAP Values)',
-                color='Importância',
-                color_continuous_scale='Viridis',
-                text=feat_importance['Importância'].apply(lambda x: f'{x:.0%}')
-            )
-            fig_shap.update_layout(yaxis={'categoryorder':'total ascending'}, height=400)
-            fig_shap.update_traces(textposition='outside')
-            st.plotly_chart(fig_shap, use_container_width=True)
+            # Fallback para gráfico Plotly
+            st.plotly_chart(fig_shap_importance(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("""
@@ -1355,45 +1345,12 @@ elif page == "🧠 Explicabilidade SHAP":
     col_multi1, col_multi2 = st.columns([2, 1])
     
     with col_multi1:
-        if os.path.exists('docs/shap_summary_bar_multiclass.png'):
-            try:
-                img_multi = Image.open('docs/shap_summary_bar_multiclass.png')
-                st.image(img_multi, caption='Importância Segmentada por Categoria de Valor', width=550)
-            except:
-                st.warning("Imagem não encontrada em docs/")
-        elif os.path.exists('shap_summary_bar_multiclass.png'):
-            try:
-                img_multi = Image.open('shap_summary_bar_multiclass.png')
-                st.image(img_multi, caption='Importância Segmentada por Categoria de Valor', width=550)
-            except:
-                st.info("Gráfico multiclasse SHAP não disponível. Execute shap_explainer.py para gerar.")
+        img = load_png(('docs/shap_summary_bar_multiclass.png', 'shap_summary_bar_multiclass.png'))
+        if img is not None:
+            st.image(img, caption='Importância Segmentada por Categoria de Valor', width=550)
         else:
             # Gráfico alternativo se a imagem não existir
-            features_list = feat_importance['Feature'].tolist()
-            categories = ['Econômico', 'Médio', 'Alto Valor']
-            
-            shap_by_class = pd.DataFrame({
-                'Feature': features_list * 3,
-                'Categoria': sum([[cat] * len(features_list) for cat in categories], []),
-                'SHAP_Value': [
-                    -0.15, -0.10, -0.08, 0.05, -0.12, -0.06,  # Econômico
-                    0.02, 0.01, 0.03, 0.08, 0.02, 0.01,       # Médio
-                    0.25, 0.20, 0.15, 0.12, 0.18, 0.10        # Alto Valor
-                ]
-            })
-            
-            fig_class = px.bar(
-                shap_by_class,
-                x='Feature',
-                y='SHAP_Value',
-                color='Categoria',
-                barmode='group',
-                title='Impacto Médio das Features por Categoria (SHAP)',
-                labels={'SHAP_Value': 'SHAP Value (impacto médio)'}
-            )
-            fig_class.update_xaxes(tickangle=-45)
-            fig_class.update_layout(height=380)
-            st.plotly_chart(fig_class, use_container_width=True)
+            st.plotly_chart(fig_shap_by_class(), use_container_width=True, config=PLOTLY_CONFIG)
     
     with col_multi2:
         st.markdown("""
@@ -1435,18 +1392,9 @@ elif page == "🧠 Explicabilidade SHAP":
         
         with col_bee1:
             st.markdown("#### Beeswarm Plot - Classe Econômico")
-            if os.path.exists('docs/shap_summary_beeswarm_Econômico.png'):
-                try:
-                    img_eco = Image.open('docs/shap_summary_beeswarm_Econômico.png')
-                    st.image(img_eco, width=500)
-                except:
-                    st.warning("Imagem não encontrada em docs/")
-            elif os.path.exists('shap_summary_beeswarm_Econômico.png'):
-                try:
-                    img_eco = Image.open('shap_summary_beeswarm_Econômico.png')
-                    st.image(img_eco, width=500)
-                except:
-                    st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py")
+            img = load_png(('docs/shap_summary_beeswarm_Econômico.png', 'shap_summary_beeswarm_Econômico.png'))
+            if img is not None:
+                st.image(img, width=500)
             else:
                 st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py para gerar.")
         
@@ -1468,18 +1416,9 @@ elif page == "🧠 Explicabilidade SHAP":
         
         with col_bee3:
             st.markdown("#### Beeswarm Plot - Classe Médio")
-            if os.path.exists('docs/shap_summary_beeswarm_Médio.png'):
-                try:
-                    img_med = Image.open('docs/shap_summary_beeswarm_Médio.png')
-                    st.image(img_med, width=500)
-                except:
-                    st.warning("Imagem não encontrada em docs/")
-            elif os.path.exists('shap_summary_beeswarm_Médio.png'):
-                try:
-                    img_med = Image.open('shap_summary_beeswarm_Médio.png')
-                    st.image(img_med, width=500)
-                except:
-                    st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py")
+            img = load_png(('docs/shap_summary_beeswarm_Médio.png', 'shap_summary_beeswarm_Médio.png'))
+            if img is not None:
+                st.image(img, width=500)
             else:
                 st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py para gerar.")
         
@@ -1503,18 +1442,9 @@ elif page == "🧠 Explicabilidade SHAP":
         
         with col_bee5:
             st.markdown("#### Beeswarm Plot - Classe Alto Valor")
-            if os.path.exists('docs/shap_summary_beeswarm_Alto Valor.png'):
-                try:
-                    img_alto = Image.open('docs/shap_summary_beeswarm_Alto Valor.png')
-                    st.image(img_alto, width=500)
-                except:
-                    st.warning("Imagem não encontrada em docs/")
-            elif os.path.exists('shap_summary_beeswarm_Alto Valor.png'):
-                try:
-                    img_alto = Image.open('shap_summary_beeswarm_Alto Valor.png')
-                    st.image(img_alto, width=500)
-                except:
-                    st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py")
+            img = load_png(('docs/shap_summary_beeswarm_Alto Valor.png', 'shap_summary_beeswarm_Alto Valor.png'))
+            if img is not None:
+                st.image(img, width=500)
             else:
                 st.info("Gráfico beeswarm não disponível. Execute shap_explainer.py para gerar.")
         
@@ -1782,7 +1712,7 @@ elif page == "🧠 Explicabilidade SHAP":
             margin=dict(l=20, r=100, t=60, b=50)
         )
         
-        st.plotly_chart(fig_waterfall, use_container_width=True)
+        st.plotly_chart(fig_waterfall, use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.markdown("#### 📊 Probabilidades Finais")
@@ -1825,7 +1755,7 @@ elif page == "🧠 Explicabilidade SHAP":
             margin=dict(l=10, r=80, t=50, b=10)
         )
         
-        st.plotly_chart(fig_prob, use_container_width=True)
+        st.plotly_chart(fig_prob, use_container_width=True, config=PLOTLY_CONFIG)
         
         # Card de predição com a categoria real prevista pelo modelo
         st.markdown(f"""
@@ -1953,6 +1883,39 @@ elif page == "🧠 Explicabilidade SHAP":
         </div>
         """, unsafe_allow_html=True)
 
+# ==================== NAVEGAÇÃO ====================
+
+# Cada página é uma função: a cada rerun só a página selecionada é executada.
+# Os nomes vêm da tupla PAGE_NAMES (dashml_constants), na mesma ordem.
+PAGES = dict(zip(PAGE_NAMES, (
+    render_visao_geral,
+    render_clustering,
+    render_classificacao,
+    render_balanceamento,
+    render_tuning,
+    render_shap,
+)))
+
+# Sidebar
+with st.sidebar:
+    st.markdown("---")
+    st.markdown("## 📊 Navegação")
+    page = st.radio("Selecione a análise:", PAGE_NAMES)
+    st.markdown("---")
+    st.info("**Dados:** ITBI Recife 2015-2023\n\n**Total:** 86.006 imóveis residenciais")
+    st.markdown("---")
+    st.markdown("### 🛠️ Tecnologias")
+    st.markdown("""
+    - **K-Means Clustering**
+    - **Random Forest**
+    - **GridSearchCV**
+    - **SHAP Values**
+    - **StandardScaler**
+    - **Streamlit**
+    """)
+
+PAGES[page]()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,172 @@
+"""
+Dados estáticos do dashboard de ML (dashML_old.py).
+
+Tabelas, séries e textos fixos exibidos pelo dashboard. Ficam num módulo
+importado, e não no script do Streamlit, porque o script é reexecutado a cada
+rerun, enquanto um módulo importado é avaliado uma única vez por processo.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# CSS customizado, com espaços e quebras de linha colapsados para encolher o
+# bloco reenviado ao navegador a cada rerun
+CUSTOM_CSS = re.sub(r'\s+', ' ', """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        padding: 1rem;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+    }
+    .insight-box {
+        background-color: #f0f2f6;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #1f77b4;
+        margin: 1rem 0;
+    }
+    .section-header {
+        font-size: 1.8rem;
+        font-weight: bold;
+        color: #1f77b4;
+        margin-top: 2rem;
+        margin-bottom: 1rem;
+    }
+</style>
+""").strip()
+
+# Config do plotly.js para os gráficos do dashboard: sem a barra de ferramentas
+# (modebar), que estes gráficos de exibição não usam. Os gráficos puramente
+# ilustrativos (cotovelo, série temporal) são renderizados estáticos, sem
+# hover nem zoom.
+PLOTLY_CONFIG = {
+    "displayModeBar": False,
+    "responsive": True,
+}
+PLOTLY_STATIC_CONFIG = {**PLOTLY_CONFIG, "staticPlot": True}
+
+# Páginas do dashboard, na ordem do seletor da sidebar
+PAGE_NAMES = (
+    "📈 Visão Geral",
+    "🎯 Clustering K-Means",
+    "🔮 Classificação ML",
+    "⚖️ Análise de Balanceamento",
+    "⚙️ Tuning (GridSearch)",
+    "🧠 Explicabilidade SHAP",
+)
+
+# Tabelas resumidas das análises de ML
+# Dados dos clusters baseados no repositório
+CLUSTER_DATA = pd.DataFrame({
+    'Cluster': ['Cluster 0: Premium Novos', 'Cluster 1: Econômicos Novos', 
+               'Cluster 2: Antigos Diversos', 'Cluster 3: Grandes Premium', 
+               'Cluster 4: Luxury'],
+    'Imóveis': [36935, 19504, 16600, 11210, 1757],
+    'Percentual': [42.9, 22.7, 19.3, 13.0, 2.0],
+    'Valor_m2': [3939, 2729, 2493, 3744, 4171],
+    'Area_Media': [99, 85, 112, 256, 194],
+    'Ano_Medio': [2015, 2013, 1981, 2006, 2013]
+})
+
+# Métricas de classificação do modelo otimizado
+CLASSIFICATION_METRICS = {
+    'accuracy': 0.78,
+    'precision_macro': 0.76,
+    'recall_macro': 0.75,
+    'f1_macro': 0.75,
+    'silhouette_score': 0.294
+}
+
+# Importância das features (SHAP): nomes e valores em paralelo; o DataFrame só
+# é montado na página que desenha o gráfico (ver feature_importance_frame em dashML_old.py)
+FEAT_NAMES = ('area_construida', 'area_terreno', 'ano_construcao', 
+              'cluster', 'bairro_Boa Viagem', 'padrao_acabamento_Alto')
+FEAT_IMP = np.array([0.32, 0.25, 0.18, 0.12, 0.08, 0.05])
+FEAT_IMP.setflags(write=False)
+
+# Dados temporais: arrays passados direto ao go.Scatter, sem DataFrame
+TEMPORAL_ANOS = np.arange(2015, 2024, dtype=np.int16)
+TEMPORAL_TRANSACOES = np.array([8500, 9200, 10500, 11200, 9800, 10100, 9500, 8900, 8300], dtype=np.int32)
+
+# Séries simuladas dos gráficos de ML, somente leitura por serem compartilhadas
+# entre reruns e sessões
+# Método do cotovelo
+ELBOW_K = np.arange(2, 11)
+ELBOW_INERTIAS = np.array([45000, 32000, 24000, 19000, 16000, 14500, 13800, 13400, 13100])
+
+# Matrizes de confusão do conjunto de teste (sem balanceamento e com SMOTEN)
+CONFUSION_ORIGINAL = np.array([
+    [1250, 180, 70],
+    [150, 1400, 200],
+    [50, 170, 1330]
+])
+CONFUSION_SMOTEN = np.array([[1180, 220, 100], [200, 1350, 200], [80, 220, 1250]])
+
+# Curvas de aprendizado
+TRAIN_SIZES = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+TRAIN_SIZES_PCT = TRAIN_SIZES * 100
+TRAIN_SCORES = 0.55 + 0.25 * (1 - np.exp(-5 * TRAIN_SIZES))
+VAL_SCORES = 0.50 + 0.28 * (1 - np.exp(-3 * TRAIN_SIZES)) - 0.05 * TRAIN_SIZES
+
+for arr in (TEMPORAL_ANOS, TEMPORAL_TRANSACOES, ELBOW_K,
+            ELBOW_INERTIAS, CONFUSION_ORIGINAL, CONFUSION_SMOTEN,
+            TRAIN_SIZES, TRAIN_SIZES_PCT, TRAIN_SCORES, VAL_SCORES):
+    arr.setflags(write=False)
+
+# Paleta qualitativa da pizza de clusters
+SET3_COLORS = tuple(px.colors.qualitative.Set3)
+
+# Cards de destaque da Visão Geral: um único template HTML preenchido por card
+METRIC_CARD_TPL = '<div class="metric-card"><h2>{valor}</h2><p>{rotulo}</p></div>'
+OVERVIEW_CARDS = (
+    ('86.006', 'Imóveis Analisados'),
+    ('5', 'Clusters Identificados'),
+    ('78%', 'Acurácia do Modelo'),
+    ('0.294', 'Silhouette Score'),
+)
+
+# Métricas por categoria e comparação com/sem SMOTEN, já em formato longo
+# (uma linha por métrica): cada gráfico sai de um único px.bar agrupado
+CATEGORY_PERFORMANCE = pd.DataFrame({
+    'Categoria': ['Econômico', 'Médio', 'Alto Valor'],
+    'Precision': [0.83, 0.75, 0.86],
+    'Recall': [0.81, 0.80, 0.78],
+    'F1-Score': [0.82, 0.77, 0.82],
+    'Suporte': [1500, 1750, 1550]
+})
+CATEGORY_PERFORMANCE_LONG = CATEGORY_PERFORMANCE.melt(
+    id_vars='Categoria', value_vars=['Precision', 'Recall', 'F1-Score'],
+    var_name='Métrica', value_name='Score'
+)
+
+SMOTEN_COMPARISON_LONG = pd.DataFrame({
+    'Configuração': ['Sem Balanceamento', 'Com SMOTEN'],
+    'Acurácia': [0.78, 0.76],
+    'Precision': [0.76, 0.74],
+    'Recall': [0.75, 0.75],
+    'F1-Score': [0.75, 0.74]
+}).melt(id_vars='Configuração', var_name='Métrica', value_name='Score')
+
+# Matrizes de confusão pelo nome, para que o cache das figuras use chaves simples
+CONFUSION_MATRICES = {'original': CONFUSION_ORIGINAL, 'smoten': CONFUSION_SMOTEN}
+CLASSES_CURTAS = ('Econômico', 'Médio', 'Alto')
+
+# Top 5 do GridSearch simulado (default_rng(42) em gridsearch_results),
+# congelado já ordenado e formatado para a tabela da página de tuning
+GRIDSEARCH_TOP5 = pd.DataFrame({
+    'Combinação': ['n=100, d=15, s=5, l=2', 'n=50, d=15, s=5, l=4', 'n=100, d=8, s=10, l=4',
+                   'n=50, d=8, s=10, l=2', 'n=100, d=15, s=5, l=4'],
+    'Acurácia_CV': ['78.00%', '77.85%', '77.56%', '77.15%', '76.94%']
+}, index=pd.RangeIndex(1, 6))
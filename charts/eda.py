@@ -10,6 +10,8 @@ if root_dir not in sys.path:
 
 from deploy.data_processing_for_deploy import load_and_preprocess_data
 from charts.charts import (
+    agregar_por_bairro,
+    filtrar_residencial,
     plot_valor_m2_por_bairro,
     plot_valor_transacao_por_acabamento,
     plot_valor_m2_por_ano,
@@ -19,13 +21,32 @@ from charts.charts import (
 
 st.set_page_config(layout="wide", page_title="Análise ITBI Recife")
 
-@st.cache_data
+# cache_resource: o DataFrame é somente leitura, então reaproveitamos o mesmo
+# objeto em vez de desserializar uma cópia a cada rerun
+@st.cache_resource
 def get_data():
     base_dir = os.path.dirname(__file__)
     data_dir = os.path.join(base_dir, "data")
     return load_and_preprocess_data(data_dir=data_dir)
 
+@st.cache_resource(show_spinner=False)
+def get_eda_figures():
+    """Constrói as figuras das seções 1-5 uma única vez por processo."""
+    df = get_data()
+    # Filtro residencial e agregado por bairro uma única vez, compartilhados
+    # pelas seções 1-4
+    df_res = filtrar_residencial(df)
+    agg_bairro = agregar_por_bairro(df_res)
+    return (
+        plot_valor_m2_por_bairro(df_res, agg_bairro=agg_bairro),
+        plot_qtd_transacoes_por_bairro(df_res, agg_bairro=agg_bairro),
+        plot_valor_transacao_por_acabamento(df_res),
+        plot_valor_m2_por_ano(df_res),
+        plot_tipo_imovel_distribuicao(df),
+    )
+
 df = get_data()
+fig_valor_m2, fig_qtd, fig_acabamento, fig_ano, fig_tipos = get_eda_figures()
 
 st.title("📊 Análise Completa do Mercado Imobiliário de Recife (ITBI 2015-2023)")
 st.markdown("""
@@ -37,19 +58,19 @@ Esta aplicação apresenta uma análise completa dos dados do ITBI de Recife:
 """)
 
 st.subheader("1. Valor Médio do Metro Quadrado por Bairro")
-st.plotly_chart(plot_valor_m2_por_bairro(df), use_container_width=True)
+st.plotly_chart(fig_valor_m2, use_container_width=True)
 
 st.subheader("2. Quantidade de Transações por Bairro")
-st.plotly_chart(plot_qtd_transacoes_por_bairro(df), use_container_width=True)
+st.plotly_chart(fig_qtd, use_container_width=True)
 
 st.subheader("3. Valor Médio da Transação por Padrão de Acabamento")
-st.plotly_chart(plot_valor_transacao_por_acabamento(df), use_container_width=True)
+st.plotly_chart(fig_acabamento, use_container_width=True)
 
 st.subheader("4. Evolução do Valor Médio do Metro Quadrado por Ano")
-st.plotly_chart(plot_valor_m2_por_ano(df), use_container_width=True)
+st.plotly_chart(fig_ano, use_container_width=True)
 
 st.subheader("5. Distribuição de Tipos de Imóveis")
-st.plotly_chart(plot_tipo_imovel_distribuicao(df), use_container_width=True)
+st.plotly_chart(fig_tipos, use_container_width=True)
 
 # Nova seção de Clusterização
 st.markdown("---")
@@ -60,14 +81,38 @@ st.markdown("*Nova funcionalidade: Segmentação inteligente do mercado residenc
 try:
     from clustering_analysis import (
         get_clustering_data_optimized,
-        create_cluster_visualizations
+        create_cluster_visualizations,
+        predominant_by_cluster
     )
     
-    @st.cache_data
+    @st.cache_resource
     def get_clustering_data():
         """Carrega dados de clusterização usando cache otimizado."""
         return get_clustering_data_optimized()
 
+    @st.cache_resource(show_spinner=False)
+    def get_cluster_figures():
+        """Figuras da clusterização, construídas uma única vez por processo."""
+        df_clustered, _, _ = get_clustering_data()
+        return create_cluster_visualizations(df_clustered)
+
+    @st.cache_data(show_spinner=False)
+    def get_clusters_info():
+        """Resumo por cluster (medianas, contagem e valores predominantes), calculado uma vez."""
+        df_clustered, _, _ = get_clustering_data()
+        # Calcular estatísticas dos clusters numa única passada do groupby
+        clusters_info = df_clustered.groupby('cluster').agg(
+            valor_m2=('valor_m2', 'median'),
+            area_construida=('area_construida', 'median'),
+            ano_construcao=('ano_construcao', 'median'),
+            count=('valor_m2', 'size'),
+        ).round(0)
+
+        # Valores predominantes via argmax na tabela de contagens (sem lambda por grupo)
+        clusters_info['tipo_imovel'] = predominant_by_cluster(df_clustered, 'tipo_imovel')
+        clusters_info['bairro_principal'] = predominant_by_cluster(df_clustered, 'bairro')
+        return clusters_info
+
     # Carregar dados de clusterização (agora ultra-rápido com cache!)
     with st.spinner("⚡ Carregando análise de clusterização..."):
         df_clustered, silhouette_score, features = get_clustering_data()
@@ -110,18 +155,8 @@ try:
     # Análise dos clusters
     st.subheader("📋 Segmentos Identificados no Mercado Residencial")
     
-    # Calcular estatísticas dos clusters
-    clusters_info = df_clustered.groupby('cluster').agg({
-        'valor_m2': 'median',
-        'area_construida': 'median', 
-        'ano_construcao': 'median',
-        'tipo_imovel': lambda x: x.value_counts().index[0]
-    }).round(0)
-
-    clusters_info['count'] = df_clustered.groupby('cluster').size()
-    clusters_info['bairro_principal'] = df_clustered.groupby('cluster')['bairro'].apply(
-        lambda x: x.value_counts().index[0]
-    )
+    # Estatísticas em cache: as varreduras de groupby/contagem não rodam a cada rerun
+    clusters_info = get_clusters_info()
 
     # Definir nomes dos clusters
     cluster_names = {
@@ -136,9 +171,12 @@ try:
     col1, col2, col3, col4, col5 = st.columns(5)
     columns = [col1, col2, col3, col4, col5]
 
-    for i, (cluster_id, col) in enumerate(zip(range(5), columns)):
+    # Um único to_dict em vez de um .loc (e uma Series de dtype misto) por cluster
+    clusters_dict = clusters_info.to_dict(orient='index')
+
+    for cluster_id, col in zip(range(5), columns):
         with col:
-            cluster_data = clusters_info.loc[cluster_id]
+            cluster_data = clusters_dict[cluster_id]
             
             st.markdown(f"**{cluster_names[cluster_id]}**")
             st.metric(
@@ -146,16 +184,18 @@ try:
                 value=f"R$ {cluster_data['valor_m2']:,.0f}/m²"
             )
             
-            st.write(f"📊 **{cluster_data['count']:,} imóveis**")
-            st.write(f"📐 Área: {cluster_data['area_construida']:.0f} m²")
-            st.write(f"📅 Ano: {cluster_data['ano_construcao']:.0f}")
-            st.write(f"🏘️ {cluster_data['bairro_principal']}")
+            st.markdown("  \n".join([
+                f"📊 **{cluster_data['count']:,} imóveis**",
+                f"📐 Área: {cluster_data['area_construida']:.0f} m²",
+                f"📅 Ano: {cluster_data['ano_construcao']:.0f}",
+                f"🏘️ {cluster_data['bairro_principal']}",
+            ]))
 
     # Visualizações dos clusters
     st.subheader("📈 Visualizações da Clusterização")
     
     # Criar as visualizações
-    fig1, fig2, fig3 = create_cluster_visualizations(df_clustered)
+    fig1, fig2, fig3 = get_cluster_figures()
     
     # Tabs para organizar gráficos
     tab1, tab2, tab3 = st.tabs(["🔍 Clusters no Espaço", "📊 Distribuição Valores", "🏠 Composição Clusters"])
@@ -56,7 +56,10 @@ def train_classification_model(df):
     )
 
     # Pipeline sem o classificador final
-    pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', RandomForestClassifier(random_state=42, n_jobs=-1))])
+    # n_jobs=1 na floresta: quem paraleliza é o GridSearchCV (n_jobs=-1), que
+    # distribui os fits (combinações × folds) entre os núcleos. Com os dois
+    # em -1, cada worker abriria um thread por núcleo e a CPU ficaria sobrecarregada
+    pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', RandomForestClassifier(random_state=42, n_jobs=1))])
 
     # 2. DEFINIR GRADE DE HIPERPARÂMETROS PARA O GRIDSEARCH
     # Nota: A grade está pequena para uma execução mais rápida.
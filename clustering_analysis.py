@@ -10,6 +10,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from deploy.data_processing_for_deploy import load_and_preprocess_data
 
+# Limite de pontos desenhados no scatter dos clusters (acima disso, amostra estratificada)
+MAX_SCATTER_POINTS = 20000
+
 def filter_residential_data(df):
     """
     Filtra apenas dados residenciais (Apartamento e Casa).
@@ -23,7 +26,10 @@ def filter_residential_data(df):
     print("=== FILTRAGEM PARA DADOS RESIDENCIAIS ===")
     
     residential_types = ['Apartamento', 'Casa']
-    df_residential = df[df['tipo_imovel'].isin(residential_types)].copy()
+    # Duas comparações diretas são mais baratas que isin() para uma lista de 2 valores.
+    # Sem .copy(): o resultado não é modificado (prepare_clustering_features já copia)
+    tipos = df['tipo_imovel']
+    df_residential = df[(tipos == residential_types[0]) | (tipos == residential_types[1])]
     
     print(f"Dataset original: {len(df):,} registros")
     print(f"Dataset filtrado: {len(df_residential):,} registros")
@@ -131,37 +137,80 @@ def analyze_clusters(df_clustered, features):
     # Nomes das colunas one-hot encoded não são ideais para o summary 'mean'/'median'
     summary_features_for_agg = [col for col in df_clustered.columns if col in ['area_construida', 'area_terreno', 'ano_construcao', 'valor_m2']]
     cluster_summary = df_clustered.groupby('cluster')[summary_features_for_agg].agg(['mean', 'median']).round(2)
+    top_bairros_by_cluster = top_by_cluster(df_clustered, 'bairro', n=3)
+
+    # Predominantes e seus percentuais, sem dois value_counts() por cluster
+    predominantes = {
+        column: predominant_by_cluster(df_clustered, column, with_share=True)
+        for column in ['tipo_imovel', 'padrao_acabamento']
+        if column in df_clustered.columns
+    }
     
-    for cluster_id in sorted(df_clustered['cluster'].unique()):
+    for cluster_id in cluster_summary.index:
         print(f"\nCluster {cluster_id}:")
-        cluster_data = df_clustered[df_clustered['cluster'] == cluster_id]
         
-        # Características principais
-        valor_m2_med = cluster_data['valor_m2'].median()
-        area_med = cluster_data['area_construida'].median()
-        ano_med = cluster_data['ano_construcao'].median()
+        # Características principais (medianas já calculadas no cluster_summary)
+        valor_m2_med = cluster_summary.loc[cluster_id, ('valor_m2', 'median')]
+        area_med = cluster_summary.loc[cluster_id, ('area_construida', 'median')]
+        ano_med = cluster_summary.loc[cluster_id, ('ano_construcao', 'median')]
         
         print(f"  • Valor m²: R$ {valor_m2_med:,.0f} (mediana)")
         print(f"  • Área construída: {area_med:.0f} m² (mediana)")
         print(f"  • Ano construção: {ano_med:.0f} (mediana)")
         
         # Tipo de imóvel predominante
-        tipo_predominante = cluster_data['tipo_imovel'].value_counts().index[0]
-        pct_tipo = (cluster_data['tipo_imovel'].value_counts().iloc[0] / len(cluster_data)) * 100
-        print(f"  • Tipo predominante: {tipo_predominante} ({pct_tipo:.1f}%)")
+        tipos, pcts = predominantes['tipo_imovel']
+        print(f"  • Tipo predominante: {tipos[cluster_id]} ({pcts[cluster_id]:.1f}%)")
         
         # Padrão de acabamento predominante
-        if 'padrao_acabamento' in cluster_data.columns:
-            acabamento_predominante = cluster_data['padrao_acabamento'].value_counts().index[0]
-            pct_acabamento = (cluster_data['padrao_acabamento'].value_counts().iloc[0] / len(cluster_data)) * 100
-            print(f"  • Padrão Acabamento predominante: {acabamento_predominante} ({pct_acabamento:.1f}%)")
+        if 'padrao_acabamento' in predominantes:
+            acabamentos, pcts = predominantes['padrao_acabamento']
+            print(f"  • Padrão Acabamento predominante: {acabamentos[cluster_id]} ({pcts[cluster_id]:.1f}%)")
         
         # Bairros mais comuns
-        top_bairros = cluster_data['bairro'].value_counts().head(3)
+        top_bairros = top_bairros_by_cluster[cluster_id]
         print(f"  • Bairros principais: {', '.join(top_bairros.index[:3])}")
     
     return cluster_summary
 
+def predominant_by_cluster(df_clustered, column, with_share=False):
+    """
+    Retorna o valor mais frequente de `column` em cada cluster.
+
+    Faz uma única contagem por (cluster, valor) e aplica argmax por linha,
+    em vez de value_counts()/mode() em cada grupo. Com `with_share=True`,
+    retorna também o percentual desse valor sobre o total do cluster.
+    """
+    counts = (
+        df_clustered.groupby(['cluster', column], observed=True)
+        .size()
+        .unstack(column, fill_value=0)
+    )
+    predominant = counts.idxmax(axis=1)
+    if not with_share:
+        return predominant
+    share = counts.max(axis=1) / df_clustered['cluster'].value_counts() * 100
+    return predominant, share
+
+def top_by_cluster(df_clustered, column, n=3):
+    """
+    Retorna, para cada cluster, os `n` valores mais frequentes de `column`
+    com suas contagens ({cluster: Series indexada pelo valor}).
+
+    Uma única contagem por (cluster, valor), ordenada uma vez, em vez de
+    filtrar o DataFrame e rodar value_counts() em cada cluster.
+    """
+    counts = (
+        df_clustered.groupby(['cluster', column], observed=True)
+        .size()
+        .sort_values(ascending=False, kind='stable')
+    )
+    top = counts.groupby(level='cluster', sort=False).head(n)
+    return {
+        cluster_id: group.droplevel('cluster')
+        for cluster_id, group in top.groupby(level='cluster')
+    }
+
 def create_cluster_visualizations(df_clustered):
     """
     Cria visualizações dos clusters.
@@ -169,12 +218,20 @@ def create_cluster_visualizations(df_clustered):
     print(f"\n=== CRIANDO VISUALIZAÇÕES ===")
     
     # Gráfico 1: Scatter plot Valor m² vs Área construída
+    # Amostra estratificada por cluster (mantém as proporções) e renderização
+    # WebGL: dezenas de milhares de pontos em SVG travam o navegador
+    df_scatter = df_clustered
+    if len(df_clustered) > MAX_SCATTER_POINTS:
+        df_scatter = df_clustered.groupby('cluster', observed=True).sample(
+            frac=MAX_SCATTER_POINTS / len(df_clustered), random_state=0
+        )
     fig1 = px.scatter(
-        df_clustered, 
+        df_scatter, 
         x='area_construida', 
         y='valor_m2',
         color='cluster',
         hover_data=['bairro', 'tipo_imovel', 'ano_construcao'],
+        render_mode='webgl',
         title='Clusters: Valor m² vs Área Construída (Dados Residenciais)',
         labels={
             'area_construida': 'Área Construída (m²)',
@@ -196,7 +253,7 @@ def create_cluster_visualizations(df_clustered):
     )
     
     # Gráfico 3: Contagem por tipo de imóvel e cluster
-    cluster_type_counts = df_clustered.groupby(['cluster', 'tipo_imovel']).size().reset_index(name='count')
+    cluster_type_counts = df_clustered.groupby(['cluster', 'tipo_imovel'], observed=True).size().reset_index(name='count')
     fig3 = px.bar(
         cluster_type_counts,
         x='cluster',
@@ -212,7 +269,7 @@ def create_cluster_visualizations(df_clustered):
 
     # Gráfico 4: Contagem por Padrão de Acabamento e Cluster
     if 'padrao_acabamento' in df_clustered.columns:
-        cluster_acabamento_counts = df_clustered.groupby(['cluster', 'padrao_acabamento']).size().reset_index(name='count')
+        cluster_acabamento_counts = df_clustered.groupby(['cluster', 'padrao_acabamento'], observed=True).size().reset_index(name='count')
         fig4 = px.bar(
             cluster_acabamento_counts,
             x='cluster',
@@ -1,6 +1,7 @@
 import os
 import json
 import unicodedata
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 import pandas as pd
@@ -305,12 +306,10 @@ def _balanced_merge(
 
 # ---------------- Fallback (sem geografia) ----------------
 
-def _balanced_regions_without_geo(
-    df: pd.DataFrame,
-    bairro_col: str,
+def _balanced_mapping_without_geo(
+    counts: pd.Series,
     min_tx_per_region: int,
-) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
-    counts = df[bairro_col].value_counts()
+) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
     bairros_sorted = counts.sort_values(ascending=True).index.tolist()
 
     regions: Dict[str, List[str]] = {}
@@ -335,11 +334,68 @@ def _balanced_regions_without_geo(
         for b in bs:
             bairro_to_region[b] = reg
 
-    df_out = df.copy()
-    df_out["regiao"] = df_out[bairro_col].map(lambda b: bairro_to_region.get(b, f"região: {str(b).strip().lower()}"))
-
     regions["__source__"] = "fallback"
-    return df_out, regions
+    return bairro_to_region, regions
+
+# ---------------- Cache das etapas caras ----------------
+
+@lru_cache(maxsize=1)
+def _load_region_units() -> Tuple[str, pd.DataFrame, Dict[int, List[int]]]:
+    """
+    Carrega a malha (bairros oficiais ou subdistritos IBGE) e a adjacência
+    uma única vez por processo: não dependem do DataFrame de entrada.
+    Retorna (source, geo_df, adjacency). Sem malha levanta LookupError, que o
+    lru_cache não guarda: a próxima chamada tenta carregar de novo.
+    """
+    for source, loader in (
+        ("bairros", _load_bairros_recife_geometries),
+        ("ibge", lambda: _load_subdistritos_geometries(IBGE_MUN_CODE_RECIFE)),
+    ):
+        geo = loader()
+        if not geo.empty:
+            adjacency = _build_adjacency(geo.rename(columns={"bairro_oficial": "unit_name"}))
+            return source, geo, adjacency
+    raise LookupError("nenhuma malha de bairros/subdistritos disponível")
+
+@lru_cache(maxsize=32)
+def _compute_regions_mapping(
+    bairro_counts: Tuple[Tuple[str, int], ...],
+    min_tx_per_region: int,
+) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Mapeamento {bairro: regiao} a partir das contagens deduplicadas por bairro,
+    na ordem do value_counts. A chave do cache é só (bairro, contagem) + min_tx,
+    então DataFrames diferentes com a mesma distribuição de bairros reutilizam o resultado.
+    Só é chamada com a malha já carregada; o fallback sem geografia não passa
+    por aqui, para não ficar em cache.
+    Os dicts retornados são compartilhados: não devem ser alterados.
+    """
+    counts = pd.Series(dict(bairro_counts), dtype="int64")
+    source, units_geo, adjacency = _load_region_units()
+
+    official = units_geo["bairro_oficial"].tolist()
+    bairros = sorted(counts.index.tolist())
+    bairro_to_off = _map_bairro_to_official(bairros, official)
+
+    # Mesma ordem do value_counts por unidade: decrescente, empates na ordem de entrada
+    counts_by_unit = (
+        counts.groupby(counts.index.map(bairro_to_off), sort=False).sum()
+        .sort_values(ascending=False, kind="stable")
+    )
+    id_by_name = dict(zip(units_geo["bairro_oficial"], units_geo["unit_id"]))
+
+    mapping = _balanced_merge(counts_by_unit, adjacency, id_by_name, min_tx_per_region)
+
+    bairro_to_region: Dict[str, str] = {}
+    for b in bairros:
+        uname = bairro_to_off.get(b, b)
+        bairro_to_region[b] = mapping.get(uname, f"região: {str(uname).strip().lower()}")
+
+    regions_dict: Dict[str, List[str]] = {}
+    for uname, region in mapping.items():
+        regions_dict.setdefault(region, []).append(uname)
+    regions_dict["__source__"] = source
+    return bairro_to_region, regions_dict
 
 # ---------------- Public API ----------------
 
@@ -354,6 +410,9 @@ def build_regions_for_recife(
       2) Subdistritos IBGE (API) -> adjacência por fronteira
       3) Fallback sem geografia (balanceado por contagem)
 
+    O agrupamento geográfico roda sobre as contagens por bairro e fica em
+    cache; aqui só é feita a junção barata do mapeamento no DataFrame.
+
     Retorna:
       - df com coluna 'regiao'
       - regions_dict com composição e chave __source__: {'bairros' | 'ibge' | 'fallback'}
@@ -363,63 +422,23 @@ def build_regions_for_recife(
         dd["regiao"] = pd.NA
         return dd, {"__source__": "fallback"}
 
-    # 1) Bairros oficiais
-    bairros_geo = _load_bairros_recife_geometries()
-    if not bairros_geo.empty:
-        official = bairros_geo["bairro_oficial"].tolist()
-        bairros = sorted(pd.Series(df[bairro_col].dropna().unique()).astype(str).tolist())
-        bairro_to_off = _map_bairro_to_official(bairros, official)
-
-        tmp = df[[bairro_col]].copy()
-        tmp["unit_name"] = tmp[bairro_col].map(bairro_to_off)
-        counts_by_unit = tmp["unit_name"].value_counts()
-
-        adjacency = _build_adjacency(bairros_geo.rename(columns={"bairro_oficial": "unit_name"}))
-        id_by_name = dict(zip(bairros_geo["bairro_oficial"], bairros_geo["unit_id"]))
-
-        mapping = _balanced_merge(counts_by_unit, adjacency, id_by_name, min_tx_per_region)
-
-        def to_region(b):
-            uname = bairro_to_off.get(b, b)
-            return mapping.get(uname, f"região: {str(uname).strip().lower()}")
-
-        df_out = df.copy()
-        df_out["regiao"] = df_out[bairro_col].map(to_region)
-
-        regions_dict: Dict[str, List[str]] = {}
-        for uname, region in mapping.items():
-            regions_dict.setdefault(region, []).append(uname)
-        regions_dict["__source__"] = "bairros"
-        return df_out, regions_dict
-
-    # 2) IBGE subdistritos
-    subs_geo = _load_subdistritos_geometries(IBGE_MUN_CODE_RECIFE)
-    if not subs_geo.empty:
-        sub_names = subs_geo["bairro_oficial"].tolist()
-        bairros = sorted(pd.Series(df[bairro_col].dropna().unique()).astype(str).tolist())
-        bairro_to_sub = _map_bairro_to_official(bairros, sub_names)
-
-        tmp = df[[bairro_col]].copy()
-        tmp["unit_name"] = tmp[bairro_col].map(bairro_to_sub)
-        counts_by_unit = tmp["unit_name"].value_counts()
-
-        adjacency = _build_adjacency(subs_geo.rename(columns={"bairro_oficial": "unit_name"}))
-        id_by_name = dict(zip(subs_geo["bairro_oficial"], subs_geo["unit_id"]))
-
-        mapping = _balanced_merge(counts_by_unit, adjacency, id_by_name, min_tx_per_region)
-
-        def to_region(b):
-            uname = bairro_to_sub.get(b, b)
-            return mapping.get(uname, f"região: {str(uname).strip().lower()}")
-
-        df_out = df.copy()
-        df_out["regiao"] = df_out[bairro_col].map(to_region)
-
-        regions_dict: Dict[str, List[str]] = {}
-        for uname, region in mapping.items():
-            regions_dict.setdefault(region, []).append(uname)
-        regions_dict["__source__"] = "ibge"
-        return df_out, regions_dict
+    # Mantém a ordem do value_counts: as ordenações de _balanced_merge e do
+    # fallback não são estáveis, e a ordem de entrada decide os empates de
+    # contagem (e com isso o bairro que dá nome a cada região)
+    counts = df[bairro_col].dropna().astype(str).value_counts()
+    try:
+        _load_region_units()
+    except LookupError:
+        bairro_to_region, regions_dict = _balanced_mapping_without_geo(counts, int(min_tx_per_region))
+    else:
+        bairro_counts = tuple(zip(counts.index, counts.astype(int).tolist()))
+        bairro_to_region, regions_dict = _compute_regions_mapping(bairro_counts, int(min_tx_per_region))
+
+    regiao = df[bairro_col].astype(str).map(bairro_to_region)
+    missing = regiao.isna()
+    if missing.any():
+        regiao[missing] = "região: " + df.loc[missing, bairro_col].astype(str).str.strip().str.lower()
 
-    # 3) Fallback sem geografia
-    return _balanced_regions_without_geo(df, bairro_col=bairro_col, min_tx_per_region=min_tx_per_region)
\ No newline at end of file
+    df_out = df.copy()
+    df_out["regiao"] = regiao.astype(object)
+    return df_out, {k: (v[:] if isinstance(v, list) else v) for k, v in regions_dict.items()}
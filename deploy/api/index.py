@@ -1,4 +1,5 @@
 import joblib
+import numpy as np
 import pandas as pd
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
@@ -12,14 +13,47 @@ class PropertyFeatures(BaseModel):
     bairro: str
     tipo_imovel: str
 
+# Ordem padrão das features (usada se o modelo não expuser feature_names_in_)
+DEFAULT_FEATURE_ORDER = [
+    "area_construida", "area_terreno", "ano_construcao",
+    "padrao_acabamento", "cluster", "bairro", "tipo_imovel"
+]
+
+# Valores neutros usados no aquecimento do modelo durante o cold start
+WARMUP_VALUES = {
+    "area_construida": 0.0, "area_terreno": 0.0, "ano_construcao": 0,
+    "padrao_acabamento": "", "cluster": 0, "bairro": "", "tipo_imovel": ""
+}
+
 # Carregamento global (executado uma vez por instância serverless)
 try:
     MODEL_PATH = "property_classifier_model_optimized2.joblib"
-    pipeline = joblib.load(MODEL_PATH)
+    # O arquivo é salvo sem compressão (joblib.dump padrão, compress=0), então os
+    # arrays das árvores são mapeados em memória e paginados sob demanda
+    pipeline = joblib.load(MODEL_PATH, mmap_mode="r")
+    # O ColumnTransformer foi treinado com um DataFrame: usamos exatamente
+    # as colunas (e a ordem) que ele espera, descartando as que não usa
+    FEATURE_ORDER = list(getattr(pipeline, "feature_names_in_", DEFAULT_FEATURE_ORDER))
 except Exception as e:
     pipeline = None
+    FEATURE_ORDER = DEFAULT_FEATURE_ORDER
     print("Erro ao carregar modelo:", e)
 
+# Buffer de entrada reutilizado entre requisições: evita inferência de dtypes
+# e alocação de um DataFrame novo a partir de dicts a cada chamada.
+# O endpoint não faz await entre o preenchimento e o predict, então o
+# buffer não é compartilhado entre requisições concorrentes no event loop.
+_input_buffer = np.empty((1, len(FEATURE_ORDER)), dtype=object)
+
+# Predição de aquecimento: carrega as páginas do modelo ainda no cold start,
+# em vez de penalizar a primeira requisição real
+if pipeline is not None:
+    try:
+        _input_buffer[0] = [WARMUP_VALUES[col] for col in FEATURE_ORDER]
+        pipeline.predict(pd.DataFrame(_input_buffer, columns=FEATURE_ORDER, copy=False))
+    except Exception as e:
+        print("Erro no aquecimento do modelo:", e)
+
 app = FastAPI()
 
 @app.get("/")
@@ -32,14 +66,15 @@ async def predict(features: PropertyFeatures):
         raise HTTPException(status_code=500, detail="Modelo não carregado")
 
     try:
-        df = pd.DataFrame([features.dict()])
-        feature_order = [
-            "area_construida", "area_terreno", "ano_construcao",
-            "padrao_acabamento", "cluster", "bairro", "tipo_imovel"
-        ]
-        df = df[feature_order]
-
-        y_pred = pipeline.predict(df)
+        values = features.__dict__
+        for i, col in enumerate(FEATURE_ORDER):
+            _input_buffer[0, i] = values[col]
+
+        # O ColumnTransformer seleciona colunas por nome, então ainda precisa
+        # de um DataFrame; envolvemos o buffer sem copiar (bloco único object)
+        X = pd.DataFrame(_input_buffer, columns=FEATURE_ORDER, copy=False)
+
+        y_pred = pipeline.predict(X)
         return {"predicted_category": y_pred[0]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -26,6 +26,7 @@ from sklearn.pipeline import Pipeline
 import joblib
 import plotly.figure_factory as ff
 import plotly.io as pio
+import json
 import time
 
 # Importar a função otimizada para carregar dados de clusterização
@@ -74,7 +75,10 @@ def train_classification_model(df):
     )
 
     # Pipeline sem o classificador final
-    pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', RandomForestClassifier(random_state=42, n_jobs=-1))])
+    # n_jobs=1 na floresta: quem paraleliza é o GridSearchCV (n_jobs=-1), que
+    # distribui os fits (combinações × folds) entre os núcleos. Com os dois
+    # em -1, cada worker abriria um thread por núcleo e a CPU ficaria sobrecarregada
+    pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', RandomForestClassifier(random_state=42, n_jobs=1))])
 
     # 2. DEFINIR GRADE DE HIPERPARÂMETROS PARA O GRIDSEARCH
     # OTIMIZADO: Parâmetros reduzidos para gerar modelo < 50MB (compatível com Supabase)
@@ -98,6 +102,17 @@ def train_classification_model(df):
     end_time = time.time()
     print(f"Otimização concluída em { (end_time - start_time) / 60:.2f} minutos.")
 
+    # Registrar o resultado da busca para o dashboard ler em vez de um valor fixo
+    gridsearch_metadata = {
+        'tempo_minutos': (end_time - start_time) / 60,
+        'n_combinacoes': len(grid_search.cv_results_['params']),
+        'cv': grid_search.n_splits_,
+        'best_score': grid_search.best_score_,
+        'best_params': grid_search.best_params_
+    }
+    with open('gridsearch_metadata.json', 'w') as f:
+        json.dump(gridsearch_metadata, f)
+
     # Exibir os melhores parâmetros encontrados
     print("\nMelhores parâmetros encontrados pelo GridSearchCV:")
     print(grid_search.best_params_)
@@ -127,7 +142,9 @@ def train_classification_model(df):
 
     # Salvar o modelo otimizado
     model_filename = 'property_classifier_model_optimized.joblib'
-    joblib.dump(best_model, model_filename)
+    # Sem compressão: a API carrega o modelo com mmap_mode='r', que só funciona
+    # em arquivos joblib não comprimidos
+    joblib.dump(best_model, model_filename, compress=0)
     
     # Verificar tamanho do modelo
     import os
@@ -1,7 +1,15 @@
 
+import numpy as np
 import pandas as pd
 import os
 
+# Colunas do ITBI usadas no pré-processamento e nas análises: o Parquet é
+# colunar, então as demais (endereço, fração ideal, etc.) nem são lidas do disco
+COLUMNS_TO_LOAD = [
+    'bairro', 'cidade', 'tipo_imovel', 'padrao_acabamento', 'ano_construcao',
+    'area_terreno', 'area_construida', 'valor_avaliacao', 'data_transacao', 'sfh'
+]
+
 def load_and_preprocess_data():
     # Diretório deste arquivo (raiz do projeto)
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -31,7 +39,7 @@ def load_and_preprocess_data():
     li = []
 
     for filename in all_files:
-        df = pd.read_parquet(filename, engine='pyarrow')
+        df = pd.read_parquet(filename, engine='pyarrow', columns=COLUMNS_TO_LOAD)
         year = [y for y in years_to_load if y in os.path.basename(filename)][0]
         print(f"   • {year}: {len(df):,} registros")
         li.append(df)
@@ -51,27 +59,42 @@ def load_and_preprocess_data():
     # Preencher valores nulos em 'sfh' com 0.0, pois parece ser um valor monetário ou indicador
     df['sfh'] = df['sfh'].fillna(0.0)
 
+    # Todos os filtros de linha viram uma única máscara booleana, aplicada
+    # uma vez no final: evita uma cópia intermediária do DataFrame por etapa
+    valor = df['valor_avaliacao'].to_numpy()
+    area = df['area_construida'].to_numpy()
+
     # Remover linhas com valores nulos em colunas críticas para a análise
-    df.dropna(subset=['bairro', 'valor_avaliacao', 'area_construida', 'padrao_acabamento'], inplace=True)
+    mask = df[['bairro', 'valor_avaliacao', 'area_construida', 'padrao_acabamento']].notna().all(axis=1).to_numpy()
 
     # Filtrar valores de área construída e valor de avaliação que fazem sentido
-    df = df[(df['area_construida'] > 0) & (df['valor_avaliacao'] > 0)]
+    mask &= (area > 0) & (valor > 0)
 
-    # Criar a coluna valor_m2
-    df['valor_m2'] = df['valor_avaliacao'] / df['area_construida']
-    
-    # Remover valores infinitos ou muito grandes que podem surgir da divisão
-    df = df[df['valor_m2'] < df['valor_m2'].quantile(0.99)] # Remove outliers superiores
-    df = df[df['valor_m2'] > df['valor_m2'].quantile(0.01)] # Remove outliers inferiores
+    # valor_m2 (divisão direta dos arrays: as colunas já estão alinhadas, então
+    # dispensamos o alinhamento de índices do pandas); as linhas com área
+    # inválida já estão fora da máscara
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valor_m2 = valor / area
 
-    # Converter 'data_transacao' para datetime
+    # Remover outliers (os quantis são calculados em sequência, como antes:
+    # o inferior sobre o que sobrou após o corte superior)
+    mask &= valor_m2 < np.quantile(valor_m2[mask], 0.99) # Remove outliers superiores
+    mask &= valor_m2 > np.quantile(valor_m2[mask], 0.01) # Remove outliers inferiores
+
+    # Filtrar apenas imóveis de Recife, se houver outros
+    mask &= (df['cidade'].str.upper() == 'RECIFE').to_numpy(dtype=bool, na_value=False)
+
+    df = df[mask].copy()
+    df['valor_m2'] = valor_m2[mask]
+
+    # Converter 'data_transacao' para datetime (só nas linhas mantidas)
     df['data_transacao'] = pd.to_datetime(df['data_transacao'])
+    # Ano da transação pré-calculado (int16): gráficos e features agrupam por
+    # ele diretamente, sem decompor a data a cada uso
+    df['ano_transacao'] = df['data_transacao'].dt.year.astype('int16')
     
     # Padronizar nomes de bairros (ex: remover espaços extras, converter para maiúsculas)
     df['bairro'] = df['bairro'].str.strip().str.upper()
-    
-    # Filtrar apenas imóveis de Recife, se houver outros
-    df = df[df['cidade'].str.upper() == 'RECIFE']
 
     return df
 
@@ -3,7 +3,7 @@ Script para gerar estatísticas reais dos clusters e modelo para o dashboard.
 """
 import pandas as pd
 import json
-from clustering_analysis import get_clustering_data_optimized
+from clustering_analysis import get_clustering_data_optimized, predominant_by_cluster, top_by_cluster
 from classification_model import create_classification_target
 from sklearn.metrics import classification_report
 import joblib
@@ -18,22 +18,37 @@ def analyze_clusters():
     
     # Estatísticas por cluster
     cluster_stats = []
+
+    # Tabela base: todas as estatísticas numéricas de todos os clusters num
+    # único groupby, em vez de filtrar o DataFrame e agregar cluster a cluster
+    base = df_clustered.groupby('cluster').agg(
+        total_imoveis=('valor_m2', 'size'),
+        valor_m2_mediano=('valor_m2', 'median'),
+        valor_m2_medio=('valor_m2', 'mean'),
+        area_construida_mediana=('area_construida', 'median'),
+        area_construida_media=('area_construida', 'mean'),
+        area_terreno_mediana=('area_terreno', 'median'),
+        ano_construcao_mediano=('ano_construcao', 'median'),
+    )
+
+    # Tipo predominante de cada cluster via argmax na tabela de contagens
+    tipo_predominante = predominant_by_cluster(df_clustered, 'tipo_imovel')
+    # Top 3 bairros de todos os clusters a partir de uma única contagem
+    top_bairros = top_by_cluster(df_clustered, 'bairro', n=3)
     
-    for cluster_id in sorted(df_clustered['cluster'].unique()):
-        cluster_data = df_clustered[df_clustered['cluster'] == cluster_id]
-        
+    for cluster_id, row in base.to_dict(orient='index').items():
         stats = {
             'cluster_id': int(cluster_id),
-            'total_imoveis': len(cluster_data),
-            'percentual': (len(cluster_data) / len(df_clustered)) * 100,
-            'valor_m2_mediano': cluster_data['valor_m2'].median(),
-            'valor_m2_medio': cluster_data['valor_m2'].mean(),
-            'area_construida_mediana': cluster_data['area_construida'].median(),
-            'area_construida_media': cluster_data['area_construida'].mean(),
-            'area_terreno_mediana': cluster_data['area_terreno'].median(),
-            'ano_construcao_mediano': cluster_data['ano_construcao'].median(),
-            'tipo_imovel_predominante': cluster_data['tipo_imovel'].mode()[0] if len(cluster_data['tipo_imovel'].mode()) > 0 else 'N/A',
-            'top_3_bairros': cluster_data['bairro'].value_counts().head(3).to_dict()
+            'total_imoveis': row['total_imoveis'],
+            'percentual': (row['total_imoveis'] / len(df_clustered)) * 100,
+            'valor_m2_mediano': row['valor_m2_mediano'],
+            'valor_m2_medio': row['valor_m2_medio'],
+            'area_construida_mediana': row['area_construida_mediana'],
+            'area_construida_media': row['area_construida_media'],
+            'area_terreno_mediana': row['area_terreno_mediana'],
+            'ano_construcao_mediano': row['ano_construcao_mediano'],
+            'tipo_imovel_predominante': tipo_predominante.get(cluster_id, 'N/A'),
+            'top_3_bairros': top_bairros[cluster_id].to_dict()
         }
         
         cluster_stats.append(stats)
@@ -17,7 +17,6 @@ def load_data():
     """
     try:
         df = pd.read_parquet("PISI3-Project/data/itbi_2023.parquet")
-        return df
     except FileNotFoundError:
         st.error("Erro: Arquivo 'itbi_2023.parquet' não encontrado. Certifique-se de que o arquivo de dados esteja em 'PISI3-Project/data/'.")
         return None
@@ -25,23 +24,82 @@ def load_data():
         st.error(f"Ocorreu um erro inesperado ao carregar o arquivo: {e}")
         return None
 
+    # --- Limpeza Inicial de Dados e Conversão de Tipo ---
+    # Não depende de nenhum filtro: feita uma vez aqui e guardada no cache,
+    # em vez de reconverter e copiar o dataset inteiro a cada interação
+    # Idem para as colunas derivadas linha a linha (tipo agrupado e value_m2):
+    # só dependem da própria linha, então o filtro de bairro pode vir depois
+    numeric_columns = ['valor_avaliacao', 'area_construida', 'area_terreno']
+    if all(col in df.columns for col in numeric_columns + ['tipo_imovel']):
+        # Converter colunas para numérico, convertendo erros para NaN
+        for col in numeric_columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        # Remover linhas onde colunas numéricas essenciais são NaN após a conversão
+        df = df.dropna(subset=numeric_columns).copy()
+
+        # --- Categorizar Tipos de Propriedade ---
+        df['tipo_agrupado'] = 'Outros' # Categoria padrão
+
+        # Classificar 'Terrenos' primeiro com base nos critérios de área
+        # Garantir que area_terreno não seja zero para evitar divisão por zero na razão
+        is_terrain_by_area = (
+            (df['area_construida'] <= 10) |
+            ((df['area_terreno'] > 0) & (df['area_construida'] / df['area_terreno'] <= 0.05))
+        )
+        df.loc[is_terrain_by_area, 'tipo_agrupado'] = 'Terreno'
+
+        # Classificar 'Apartamento' e 'Casa'
+        df.loc[df['tipo_imovel'] == 'Apartamento', 'tipo_agrupado'] = 'Apartamento'
+        df.loc[df['tipo_imovel'] == 'Casa', 'tipo_agrupado'] = 'Casa'
+
+        # --- Calcular 'value_m2' com base no tipo agrupado ---
+        df['value_m2'] = np.nan # Inicializar com NaN
+
+        # Máscara para 'Apartamento' válido com base nos limites de area_construida
+        valid_apartment_area_mask = (
+            (df['tipo_agrupado'] == 'Apartamento') &
+            (df['area_construida'] >= 25) &
+            (df['area_construida'] <= 350)
+        )
+
+        # Máscara para 'Casa' (sem limites específicos de area_construida ainda)
+        valid_casa_mask = (df['tipo_agrupado'] == 'Casa')
+
+        # Combinar máscaras para cálculo residencial
+        residential_mask = (
+            (valid_apartment_area_mask | valid_casa_mask) &
+            (df['area_construida'] > 0) &
+            (df['valor_avaliacao'].notna())
+        )
+        df.loc[residential_mask, 'value_m2'] = df['valor_avaliacao'] / df['area_construida']
+
+        # Para Terrenos: valor_avaliacao / area_terreno
+        terrain_mask = (
+            (df['tipo_agrupado'] == 'Terreno') &
+            (df['area_terreno'] > 0) &
+            (df['valor_avaliacao'].notna())
+        )
+        df.loc[terrain_mask, 'value_m2'] = df['valor_avaliacao'] / df['area_terreno']
+    return df
+
+@st.cache_data
+def get_bairro_options():
+    """Lista ordenada de bairros para o filtro global (calculada uma vez, não a cada rerun)."""
+    df = load_data()
+    if df is None or 'bairro' not in df.columns:
+        return []
+    return sorted(df['bairro'].dropna().unique().tolist())
+
 df = load_data()
 
 if df is not None:
-    # --- Limpeza Inicial de Dados e Conversão de Tipo ---
+    # --- Verificação das colunas (a limpeza numérica já vem pronta de load_data) ---
     required_columns = ['valor_avaliacao', 'area_construida', 'area_terreno', 'tipo_imovel', 'bairro']
     if not all(col in df.columns for col in required_columns):
         st.error(f"Erro: Colunas essenciais faltando no dataset. Esperadas: {required_columns}")
         st.stop()
 
-    # Converter colunas para numérico, convertendo erros para NaN
-    df['valor_avaliacao'] = pd.to_numeric(df['valor_avaliacao'], errors='coerce')
-    df['area_construida'] = pd.to_numeric(df['area_construida'], errors='coerce')
-    df['area_terreno'] = pd.to_numeric(df['area_terreno'], errors='coerce')
-
-    # Remover linhas onde colunas numéricas essenciais são NaN após a conversão
-    df.dropna(subset=['valor_avaliacao', 'area_construida', 'area_terreno'], inplace=True)
-
     # --- NOVA VERIFICAÇÃO: Parar se o DataFrame estiver vazio após o dropna inicial ---
     if df.empty:
         st.error("Erro: Nenhum dado válido restante após a limpeza inicial de valores ausentes/inválidos nas colunas essenciais (valor_avaliacao, area_construida, area_terreno). Por favor, verifique seus dados.")
@@ -49,7 +107,7 @@ if df is not None:
 
     # --- Filtro de Bairro (Aplicado a todo o DataFrame no início) ---
     st.sidebar.header("Filtros Globais")
-    all_bairros = df['bairro'].unique().tolist()
+    all_bairros = get_bairro_options()
     selected_bairros = st.sidebar.multiselect(
         "Selecionar Bairro(s)",
         options=all_bairros,
@@ -66,50 +124,6 @@ if df is not None:
         st.warning("Nenhum dado restante após aplicar o filtro de bairro. Por favor, ajuste suas seleções.")
         st.stop()
 
-    # --- Categorizar Tipos de Propriedade ---
-    df['tipo_agrupado'] = 'Outros' # Categoria padrão
-
-    # Classificar 'Terrenos' primeiro com base nos critérios de área
-    # Garantir que area_terreno não seja zero para evitar divisão por zero na razão
-    is_terrain_by_area = (
-        (df['area_construida'] <= 10) |
-        ((df['area_terreno'] > 0) & (df['area_construida'] / df['area_terreno'] <= 0.05))
-    )
-    df.loc[is_terrain_by_area, 'tipo_agrupado'] = 'Terreno'
-
-    # Classificar 'Apartamento' e 'Casa'
-    df.loc[df['tipo_imovel'] == 'Apartamento', 'tipo_agrupado'] = 'Apartamento'
-    df.loc[df['tipo_imovel'] == 'Casa', 'tipo_agrupado'] = 'Casa'
-
-    # --- Calcular 'value_m2' com base no tipo agrupado ---
-    df['value_m2'] = np.nan # Inicializar com NaN
-
-    # Máscara para 'Apartamento' válido com base nos limites de area_construida
-    valid_apartment_area_mask = (
-        (df['tipo_agrupado'] == 'Apartamento') &
-        (df['area_construida'] >= 25) &
-        (df['area_construida'] <= 350)
-    )
-
-    # Máscara para 'Casa' (sem limites específicos de area_construida ainda)
-    valid_casa_mask = (df['tipo_agrupado'] == 'Casa')
-
-    # Combinar máscaras para cálculo residencial
-    residential_mask = (
-        (valid_apartment_area_mask | valid_casa_mask) &
-        (df['area_construida'] > 0) &
-        (df['valor_avaliacao'].notna())
-    )
-    df.loc[residential_mask, 'value_m2'] = df['valor_avaliacao'] / df['area_construida']
-
-    # Para Terrenos: valor_avaliacao / area_terreno
-    terrain_mask = (
-        (df['tipo_agrupado'] == 'Terreno') &
-        (df['area_terreno'] > 0) &
-        (df['valor_avaliacao'].notna())
-    )
-    df.loc[terrain_mask, 'value_m2'] = df['valor_avaliacao'] / df['area_terreno']
-
     st.success("Imóveis categorizados e 'value_m2' calculado por tipo, com filtragem de área para apartamentos.")
 
     st.subheader("Pré-visualização de Dados Brutos (com novas colunas)")
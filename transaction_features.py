@@ -43,7 +43,7 @@ def add_transaction_volume_feature(df: pd.DataFrame) -> pd.DataFrame:
 
     # 1. Calcula quantas transações ocorreram por combinação (bairro, ano_transacao)
     # 3. Boas práticas: Não remover registros
-    transaction_volume = df_copy.groupby(['bairro', 'ano_transacao']).size().reset_index(name='volume_transacoes_bairro_ano')
+    transaction_volume = df_copy.groupby(['bairro', 'ano_transacao'], observed=True, sort=False).size().reset_index(name='volume_transacoes_bairro_ano')
     print("Volume de transações por bairro e ano calculado.")
 
     # 1. Faz o merge dessa informação para cada linha do DataFrame original